@@ -0,0 +1,180 @@
+"""Regenerate the offline ESPN fixtures used by ``benchmarks/run.py``.
+
+The payloads follow the shape of ESPN's site API (``teams/<id>/schedule``
+and ``summary``), including the bulky sections the bot never reads
+(commentary, rosters, odds, news) so parse benchmarks see realistic sizes.
+Crest URLs use the ``{{BASE}}`` placeholder, which the local stand-in
+server replaces with its own address.  Output is deterministic.
+
+    python benchmarks/fixtures/generate.py
+"""
+import json
+import os
+import random
+
+from PIL import Image, ImageDraw
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ARSENAL = {"id": "359", "displayName": "Arsenal", "color": (239, 1, 7)}
+OPPONENTS = {
+    "363": {"displayName": "Chelsea", "color": (3, 70, 148)},
+    "382": {"displayName": "Manchester City", "color": (108, 171, 221)},
+    "364": {"displayName": "Liverpool", "color": (200, 16, 46)},
+    "367": {"displayName": "Tottenham Hotspur", "color": (19, 34, 87)},
+    "132": {"displayName": "Bayern Munich", "color": (220, 5, 45)},
+}
+SURNAMES = ["Saka", "Odegaard", "Havertz", "Martinelli", "Trossard", "Rice", "Saliba",
+            "Gabriel", "White", "Jesus", "Palmer", "Haaland", "Salah", "Son", "Kane"]
+
+# case name -> (match id, league, opponent id, options)
+CASES = {
+    "typical": ("700001", "eng.1", "363", {}),
+    "no_xg": ("700002", "eng.fa", "382", {"xg": False}),
+    "many_scorers": ("700003", "eng.1", "364", {"goals": (6, 4)}),
+    "own_goals": ("700004", "eng.1", "367", {"own_goals": True}),
+    "no_attendance": ("700005", "uefa.champions", "132", {"attendance": None}),
+}
+
+
+def crest_href(team_id):
+    return "{{BASE}}/crests/%s.png" % team_id
+
+
+def team(team_id, name):
+    return {"id": team_id, "displayName": name, "logos": [{"href": crest_href(team_id)}]}
+
+
+def stats(rng, xg):
+    poss = round(rng.uniform(35, 65), 1)
+    rows = [
+        ("possessionPct", f"{poss}"),
+        ("totalShots", str(rng.randint(5, 22))),
+        ("shotsOnTarget", str(rng.randint(1, 9))),
+        ("passPct", f"{rng.uniform(0.7, 0.92):.2f}"),
+        ("wonCorners", str(rng.randint(1, 12))),
+        ("foulsCommitted", str(rng.randint(5, 18))),
+        ("yellowCards", str(rng.randint(0, 4))),
+        ("offsides", str(rng.randint(0, 5))),
+        ("saves", str(rng.randint(0, 7))),
+    ]
+    if xg:
+        rows.append(("expectedGoals", f"{rng.uniform(0.2, 3.1):.2f}"))
+    return [{"name": n, "displayValue": v, "label": n} for n, v in rows]
+
+
+def goal(rng, team_id, minute, own_goal=False):
+    return {
+        "scoringPlay": True,
+        "ownGoal": own_goal,
+        "penaltyKick": False,
+        "clock": {"value": minute * 60, "displayValue": f"{minute}'"},
+        "team": {"id": team_id},
+        "participants": [{"athlete": {"displayName": f"Player {rng.choice(SURNAMES)}"}}],
+        "type": {"text": "Goal"},
+    }
+
+
+def summary(match_id, league, opp_id, opts, rng):
+    opp = OPPONENTS[opp_id]
+    n_ars, n_opp = opts.get("goals", (rng.randint(0, 3), rng.randint(0, 2)))
+    details = [goal(rng, "359", rng.randint(1, 90)) for _ in range(n_ars)]
+    details += [goal(rng, opp_id, rng.randint(1, 90)) for _ in range(n_opp)]
+    if opts.get("own_goals"):
+        # Credited to the benefiting side, as ESPN does.
+        details.append(goal(rng, "359", 77, own_goal=True))
+        n_ars += 1
+    details += [{"scoringPlay": False, "yellowCard": True, "clock": {"displayValue": f"{m}'"},
+                 "team": {"id": rng.choice(["359", opp_id])}} for m in rng.sample(range(1, 90), 4)]
+    details.sort(key=lambda d: int(d["clock"]["displayValue"].rstrip("'")))
+
+    date = f"2025-0{rng.randint(1, 9)}-{rng.randint(10, 28)}T15:00Z"
+    competitors = [
+        {"id": "359", "homeAway": "home", "score": str(n_ars), "team": team("359", "Arsenal")},
+        {"id": opp_id, "homeAway": "away", "score": str(n_opp), "team": team(opp_id, opp["displayName"])},
+    ]
+    game_info = {"venue": {"fullName": "Emirates Stadium", "address": {"city": "London"}},
+                 "officials": [{"displayName": "Michael Oliver", "position": {"name": "Referee"}}]}
+    attendance = opts.get("attendance", 60251)
+    if attendance is not None:
+        game_info["attendance"] = attendance
+
+    roster = lambda tid: {"team": {"id": tid}, "roster": [  # noqa: E731
+        {"athlete": {"id": str(rng.randint(10000, 99999)), "displayName": f"Player {rng.choice(SURNAMES)} {i}",
+                     "position": {"abbreviation": rng.choice(["G", "D", "M", "F"])}},
+         "starter": i < 11, "jersey": str(i + 1),
+         "stats": [{"name": s, "value": rng.randint(0, 5)} for s in
+                   ("totalGoals", "goalAssists", "shotsOnTarget", "foulsCommitted", "saves", "offsides")]}
+        for i in range(20)]}
+
+    return {
+        "header": {
+            "id": match_id,
+            "league": {"name": {"eng.1": "English Premier League", "eng.fa": "English FA Cup",
+                                "uefa.champions": "UEFA Champions League"}[league], "slug": league},
+            "competitions": [{
+                "id": match_id, "date": date,
+                "status": {"type": {"state": "post", "name": "STATUS_FULL_TIME", "shortDetail": "FT"},
+                           "period": 2, "clock": 5400.0},
+                "competitors": competitors,
+                "details": details,
+            }],
+        },
+        "gameInfo": game_info,
+        "boxscore": {"teams": [
+            {"team": {"id": "359"}, "statistics": stats(rng, opts.get("xg", True))},
+            {"team": {"id": opp_id}, "statistics": stats(rng, opts.get("xg", True))},
+        ]},
+        "rosters": [roster("359"), roster(opp_id)],
+        "commentary": [{"sequence": i, "time": {"displayValue": f"{i // 3}'"},
+                        "text": f"Commentary line {i}: " + " ".join(rng.choice(SURNAMES) for _ in range(20))}
+                       for i in range(300)],
+        "odds": [{"provider": {"name": f"Book {i}"}, "details": f"{rng.uniform(1, 6):.2f}"} for i in range(10)],
+        "news": {"articles": [{"headline": f"Story {i}", "description": " ".join(rng.choice(SURNAMES) for _ in range(60))}
+                              for i in range(15)]},
+    }
+
+
+def schedule_event(match_id, opp_id, summary_payload):
+    comp = summary_payload["header"]["competitions"][0]
+    return {
+        "id": match_id,
+        "date": comp["date"],
+        "name": f"{OPPONENTS[opp_id]['displayName']} at Arsenal",
+        "competitions": [{"status": comp["status"], "competitors": comp["competitors"]}],
+    }
+
+
+def crest(path, color):
+    img = Image.new("RGBA", (200, 240), (0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+    d.polygon([(10, 10), (190, 10), (190, 150), (100, 230), (10, 150)], fill=color + (255,))
+    d.ellipse([60, 50, 140, 130], fill=(255, 255, 255, 255))
+    img.save(path, format="PNG")
+
+
+def main():
+    rng = random.Random(359)
+    for sub in ("summaries", "schedules", "crests"):
+        os.makedirs(os.path.join(HERE, sub), exist_ok=True)
+
+    schedules = {}
+    for name, (match_id, league, opp_id, opts) in CASES.items():
+        payload = summary(match_id, league, opp_id, opts, rng)
+        with open(os.path.join(HERE, "summaries", f"{match_id}.json"), "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        schedules.setdefault(league, []).append(schedule_event(match_id, opp_id, payload))
+
+    for league, events in schedules.items():
+        with open(os.path.join(HERE, "schedules", f"{league}.json"), "w") as f:
+            json.dump({"events": events}, f, indent=1)
+
+    crest(os.path.join(HERE, "crests", "359.png"), ARSENAL["color"])
+    for opp_id, opp in OPPONENTS.items():
+        crest(os.path.join(HERE, "crests", f"{opp_id}.png"), opp["color"])
+
+    with open(os.path.join(HERE, "cases.json"), "w") as f:
+        json.dump({name: case[0] for name, case in CASES.items()}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
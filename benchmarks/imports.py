@@ -0,0 +1,93 @@
+"""Cold-start import report.
+
+Imports each entry point in fresh interpreters under ``-X importtime`` and
+reports the median total import time, whether Pillow was loaded and the
+slowest top-level packages.  The ``+render`` rows also import the renderer,
+which is what an entry point pays once it has a card to make.
+
+    python benchmarks/imports.py --json before.json
+    python benchmarks/imports.py --json after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+TARGETS = {
+    "app": "import app",
+    "app+render": "import app, gunner_bot.rendering, gunner_bot.encoding",
+    "daemon": "import gunner_bot.daemon",
+    "teams": "import gunner_bot.teams",
+    "scheduling": "import gunner_bot.scheduling",
+}
+
+
+def profile(statement):
+    """Return ``({package: self_us}, total_us, pil_loaded)`` for one cold import."""
+    code = f"{statement}; import sys; print('PIL' in sys.modules)"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    packages, total = {}, 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+        total += int(self_us)
+    return packages, total, proc.stdout.strip() == "True"
+
+
+def run(runs, top):
+    results = {}
+    for name, statement in TARGETS.items():
+        samples = [profile(statement) for _ in range(runs)]
+        totals = [total for _packages, total, _pil in samples]
+        packages = {}
+        for sample, _total, _pil in samples:
+            for package, us in sample.items():
+                packages.setdefault(package, []).append(us)
+        slowest = sorted(((statistics.median(v) / 1000, k) for k, v in packages.items()), reverse=True)[:top]
+        results[name] = {
+            "median_ms": statistics.median(totals) / 1000,
+            "min_ms": min(totals) / 1000,
+            "pil": samples[0][2],
+            "slowest": {package: ms for ms, package in slowest},
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import times for the Gunner Bot entry points.")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=5, help="Slowest packages to list per entry point")
+    parser.add_argument("--json", help="Write the machine-readable report here")
+    parser.add_argument("--compare", help="Earlier report to compare medians against")
+    args = parser.parse_args()
+
+    results = run(args.runs, args.top)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print(f"{'entry point':<14}{'median ms':>11}{'min ms':>9}{'PIL':>5}" + (f"{'baseline':>10}{'change':>9}" if baseline else ""))
+    for name, r in results.items():
+        line = f"{name:<14}{r['median_ms']:>11.1f}{r['min_ms']:>9.1f}{'yes' if r['pil'] else 'no':>5}"
+        if name in baseline:
+            before = baseline[name]["median_ms"]
+            line += f"{before:>10.1f}{(r['median_ms'] - before) / before * 100:>+8.1f}%"
+        print(line)
+        print("    " + ", ".join(f"{package} {ms:.1f}" for package, ms in r["slowest"].items()))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Microbenchmark for the rendering primitives.
+
+Times ``draw_gradient_pill`` and ``draw_shadow_rect`` against the original
+per-column / full-canvas implementations (kept below as ``legacy_*``) and
+checks that both produce the same pixels.
+
+    python benchmarks/primitives.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter  # noqa: E402
+
+from gunner_bot.config import THEME  # noqa: E402
+from gunner_bot.rendering import draw_gradient_pill, draw_shadow_rect  # noqa: E402
+
+CANVAS = (1080, 1500)
+
+
+def legacy_draw_shadow_rect(img, x1, y1, x2, y2, radius, blur=20, offset_x=5, offset_y=7, opacity=130):
+    shadow_layer = Image.new('RGBA', img.size, (0, 0, 0, 0))
+    sd = ImageDraw.Draw(shadow_layer)
+    sd.rounded_rectangle(
+        [x1 + offset_x, y1 + offset_y, x2 + offset_x, y2 + offset_y],
+        radius=radius, fill=(0, 0, 0, opacity)
+    )
+    shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(radius=blur))
+    img.paste(shadow_layer.convert('RGB'), (0, 0), shadow_layer.split()[3])
+
+
+def legacy_draw_gradient_pill(img, x, y, width, height, color_left, color_right):
+    def hex_to_rgb(h):
+        return tuple(int(h.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+
+    lr, lg, lb = hex_to_rgb(color_left)
+    rr, rg, rb = hex_to_rgb(color_right)
+
+    grad = Image.new('RGB', (width, height))
+    grad_d = ImageDraw.Draw(grad)
+    for col in range(width):
+        t = col / max(width - 1, 1)
+        grad_d.line([(col, 0), (col, height - 1)],
+                    fill=(int(lr + t*(rr-lr)), int(lg + t*(rg-lg)), int(lb + t*(rb-lb))))
+
+    mask = Image.new('L', (width, height), 0)
+    ImageDraw.Draw(mask).rounded_rectangle([0, 0, width - 1, height - 1],
+                                            radius=height // 2, fill=255)
+    img.paste(grad, (x, y), mask)
+
+
+CASES = {
+    "gradient_pill": (
+        legacy_draw_gradient_pill, draw_gradient_pill,
+        (200, 700, 320, 24, THEME["RED"], THEME["RED_HI"]),
+    ),
+    "shadow_rect (score box)": (
+        legacy_draw_shadow_rect, draw_shadow_rect,
+        (40, 40, 1040, 590, 40),
+    ),
+    "shadow_rect (interior)": (
+        legacy_draw_shadow_rect, draw_shadow_rect,
+        (300, 500, 700, 800, 20),
+    ),
+}
+
+
+def max_diff(before, after, args):
+    a = Image.new('RGB', CANVAS, THEME["BG"])
+    b = a.copy()
+    before(a, *args)
+    after(b, *args)
+    return max(hi for _, hi in ImageChops.difference(a, b).getextrema())
+
+
+def run(repeat):
+    base = Image.new('RGB', CANVAS, THEME["BG"])
+    results = []
+    for name, (before, after, args) in CASES.items():
+        timings = []
+        for fn in (before, after):
+            img = base.copy()
+            timings.append(min(timeit.repeat(lambda: fn(img, *args), number=1, repeat=repeat)) * 1000)
+        results.append((name, timings[0], timings[1], max_diff(before, after, args)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'primitive':<26}{'before ms':>11}{'after ms':>10}{'speedup':>9}{'max diff':>10}")
+    for name, before_ms, after_ms, diff in run(args.repeat):
+        print(f"{name:<26}{before_ms:>11.3f}{after_ms:>10.3f}{before_ms / after_ms:>8.1f}x{diff:>10}")
+
+
+if __name__ == "__main__":
+    main()
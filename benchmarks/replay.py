@@ -0,0 +1,295 @@
+"""End-to-end replay: final whistle to live post, entirely offline.
+
+Replays ``fixtures/timeline.json`` (fixture 700001 going ``pre`` -> ``in``
+-> ``post``) from a local ESPN stand-in and runs the resident poll loop
+(``--mode daemon``) or ``app.py``'s one-attempt-per-interval loop
+(``--mode app``) against it and a local Bluesky XRPC stand-in, then reports
+whistle-to-post latency, request counts and what happened under injected
+delays and 503s.
+
+    python benchmarks/replay.py
+    python benchmarks/replay.py --scenario flaky --runs 10 --json replay.json
+    python benchmarks/replay.py --espn-errors 0.3 --bsky-delay 1.5
+
+Each run is a fresh interpreter with an empty cache, ledger and session
+file, as on a new poller job.  Time runs on a match clock: the bot's sleeps
+between polls are cut by ``--speed`` and skipped over, while everything
+else (HTTP, parsing, rendering, retries and injected delays) runs at real
+speed, so latencies are in match seconds and comparable to a live game.
+HTTP cache lifetimes are scaled by the same factor.
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Fault presets: seconds of delay and share of 503s per stand-in.
+SCENARIOS = {
+    "clean": {},
+    "slow": {"espn": {"delay": 0.5}, "bsky": {"delay": 1.5}},
+    "flaky": {"espn": {"error_rate": 0.2}, "bsky": {"error_rate": 0.2}},
+}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class ReplayClock:
+    """Seconds since kick-off; ``sleep`` waits ``1/speed`` of the time and skips the rest."""
+
+    def __init__(self, start, speed):
+        self.speed = speed
+        self.kickoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=start)
+        self._origin = time.monotonic() - start
+        self._skipped = 0.0
+
+    def match_time(self):
+        return time.monotonic() - self._origin + self._skipped
+
+    def now(self):
+        return self.kickoff + datetime.timedelta(seconds=self.match_time())
+
+    def sleep(self, seconds):
+        time.sleep(seconds / self.speed)
+        self._skipped += seconds - seconds / self.speed
+
+
+def _datetime_module(clock):
+    """A stand-in for the ``datetime`` module whose ``datetime.now()`` reads ``clock``."""
+    class _Datetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.now().astimezone(tz) if tz else clock.now()
+
+    return types.SimpleNamespace(datetime=_Datetime, timezone=datetime.timezone, timedelta=datetime.timedelta)
+
+
+def _endpoint(path):
+    """Group request paths by endpoint: ``scoreboard``, ``crests``, ``createRecord`` ..."""
+    path = path.split("?")[0].rstrip("/")
+    if "/crests/" in path:
+        return "crests"
+    return path.rsplit("/", 1)[-1].rsplit(".", 1)[-1]
+
+
+def _by_endpoint(counts):
+    grouped = {}
+    for path, n in counts.items():
+        grouped[_endpoint(path)] = grouped.get(_endpoint(path), 0) + n
+    return grouped
+
+
+def child(spec):
+    """Run one replay and print its result as JSON on the last line of stdout."""
+    sys.path.insert(0, os.path.join(HERE, ".."))
+    sys.path.insert(0, HERE)
+    from standin import BlueskyStandIn, ESPNStandIn, _Handler
+
+    with open(os.path.join(HERE, "fixtures", "timeline.json")) as f:
+        timeline = json.load(f)
+    clock = ReplayClock(spec["start"], spec["speed"])
+    kickoff = clock.kickoff.strftime("%Y-%m-%dT%H:%MZ")
+    whistle = next(s["at"] for s in timeline["statuses"] if s["state"] == "post")
+    observed = {"revealed": None, "posts": []}
+
+    def status_at(t):
+        current = [s for s in timeline["statuses"] if s["at"] <= t][-1]
+        clock_s = current["clock"] + (t - current["at"] if current.get("running") else 0)
+        detail = current.get("detail") or f"{int(clock_s // 60) + 1}'"
+        return {"type": {"state": current["state"], "name": current["name"], "shortDetail": detail},
+                "period": current["period"], "clock": float(clock_s)}
+
+    class TimelineHandler(_Handler):
+        def _event(self):
+            t = clock.match_time()
+            schedule = json.loads(self._fixture("schedules", f"{timeline['league']}.json"))
+            event = next(e for e in schedule["events"] if e["id"] == timeline["match"])
+            event["date"] = kickoff
+            event["competitions"][0]["status"] = status = status_at(t)
+            if status["type"]["state"] == "post" and observed["revealed"] is None:
+                observed["revealed"] = t
+            return schedule, event
+
+        def _route(self, url, parts):
+            if parts[0] == timeline["league"] and parts[-1] == "scoreboard":
+                _schedule, event = self._event()
+                return json.dumps({"events": [event]}).encode(), "application/json"
+            if parts[0] == timeline["league"] and parts[-1] == "schedule":
+                schedule, event = self._event()
+                schedule["events"] = [event if e["id"] == event["id"] else e for e in schedule["events"]]
+                return json.dumps(schedule).encode(), "application/json"
+            if parts[-1] == "summary" and f"event={timeline['match']}" in url.query:
+                summary = json.loads(self._fixture("summaries", f"{timeline['match']}.json"))
+                competition = summary["header"]["competitions"][0]
+                competition["date"] = kickoff
+                t = clock.match_time()
+                # ESPN's summary lags the scoreboard at full time.
+                competition["status"] = status_at(t if t >= whistle + timeline["summary_lag"] else min(t, whistle - 1))
+                return json.dumps(summary).encode(), "application/json"
+            return super()._route(url, parts)
+
+    espn = ESPNStandIn(handler=TimelineHandler, seed=spec["seed"], **spec["espn"]).start()
+    bsky = BlueskyStandIn(seed=spec["seed"] + 1, **spec["bsky"]).start()
+    bsky.on_post = lambda uri, record: observed["posts"].append(clock.match_time())
+
+    cache_dir = tempfile.mkdtemp(prefix="gunner-replay-")
+    os.chdir(cache_dir)  # dry runs save the card to the working directory
+    os.environ.update({
+        "ESPN_BASE_URL": espn.base_url,
+        "BSKY_BASE_URL": bsky.base_url,
+        "BSKY_HANDLE": bsky.handle,
+        "BSKY_PASSWORD": "replay",
+        "GUNNER_CACHE_DIR": cache_dir,
+        "BSKY_SESSION_FILE": os.path.join(cache_dir, "bsky_session.json"),
+        "GUNNER_LEDGER_FILE": os.path.join(cache_dir, "posted.sqlite3"),
+        "GUNNER_FIXTURES_FILE": os.path.join(cache_dir, "fixtures.sqlite3"),
+    })
+
+    import logging
+
+    from gunner_bot import daemon, runner
+    from gunner_bot.config import CACHE_TTL
+    from gunner_bot.publishing import get_bluesky_session
+
+    logging.basicConfig(level=logging.INFO if spec["verbose"] else logging.WARNING, stream=sys.stderr,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    for key in CACHE_TTL:
+        CACHE_TTL[key] /= spec["speed"]
+    daemon.time = types.SimpleNamespace(sleep=clock.sleep, monotonic=clock.match_time)
+    daemon.datetime = runner.datetime = _datetime_module(clock)
+
+    started = time.monotonic()
+    if spec["mode"] == "daemon":
+        code = daemon.poll(spec["max_poll"], spec["interval"])
+    else:
+        deadline = clock.match_time() + spec["max_poll"]
+        while True:
+            code = runner.run_once(get_bluesky_session())
+            if code == runner.POSTED or clock.match_time() + spec["interval"] > deadline:
+                break
+            clock.sleep(spec["interval"])
+    wall = time.monotonic() - started
+
+    result = {
+        "exit": code,
+        "posts": len(observed["posts"]),
+        "whistle_to_post": observed["posts"][0] - whistle if observed["posts"] else None,
+        "detect": observed["revealed"] - whistle if observed["revealed"] is not None else None,
+        "espn_requests": _by_endpoint(espn.requests),
+        "bsky_requests": _by_endpoint(bsky.requests),
+        "errors": sum(espn.errors.values()) + sum(bsky.errors.values()),
+        "wall_s": wall,
+    }
+    espn.stop()
+    bsky.stop()
+    print(json.dumps(result))
+
+
+def replay(spec):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", json.dumps(spec)],
+                          capture_output=True, text=True)
+    if spec["verbose"] or proc.returncode:
+        sys.stderr.write(proc.stderr)
+    if proc.returncode:
+        raise RuntimeError(f"replay run exited {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    latencies = [r["whistle_to_post"] for r in runs if r["whistle_to_post"] is not None]
+    detections = [r["detect"] for r in runs if r["detect"] is not None]
+    requests = {}
+    for side in ("espn_requests", "bsky_requests"):
+        for endpoint in sorted({e for r in runs for e in r[side]}):
+            requests[endpoint] = sum(r[side].get(endpoint, 0) for r in runs) / len(runs)
+    return {
+        "runs": len(runs),
+        "posted": sum(1 for r in runs if r["exit"] == 0),
+        "duplicates": sum(max(r["posts"] - 1, 0) for r in runs),
+        "p50_s": _percentile(latencies, 50) if latencies else None,
+        "p90_s": _percentile(latencies, 90) if latencies else None,
+        "max_s": max(latencies) if latencies else None,
+        "detect_p50_s": _percentile(detections, 50) if detections else None,
+        "errors_injected": sum(r["errors"] for r in runs) / len(runs),
+        "wall_s": statistics.mean(r["wall_s"] for r in runs),
+        "exits": sorted(r["exit"] for r in runs),
+        "requests": requests,
+    }
+
+
+def _fmt(value, spec="{:.0f}"):
+    return "-" if value is None else spec.format(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a match against local ESPN and Bluesky stand-ins.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Fault preset (repeatable; default: all unless a custom fault is given)")
+    parser.add_argument("--espn-delay", type=float, help="Custom scenario: seconds before each ESPN response")
+    parser.add_argument("--espn-errors", type=float, help="Custom scenario: share of ESPN requests that get a 503")
+    parser.add_argument("--bsky-delay", type=float, help="Custom scenario: seconds before each Bluesky response")
+    parser.add_argument("--bsky-errors", type=float, help="Custom scenario: share of Bluesky requests that get a 503")
+    parser.add_argument("--mode", choices=["daemon", "app"], default="daemon",
+                        help="Resident poll loop or one app.py attempt per --interval (default: daemon)")
+    parser.add_argument("--runs", type=int, default=3, help="Replays per scenario (default: 3)")
+    parser.add_argument("--speed", type=float, default=120, help="Sleep speed-up factor (default: 120)")
+    parser.add_argument("--start", type=int, default=5400,
+                        help="Match seconds after kick-off to start the replay at (default: 5400)")
+    parser.add_argument("--max-poll", type=int, default=7200, help="Polling window in match seconds (default: 7200)")
+    parser.add_argument("--interval", type=int, default=300, help="Attempt interval in match seconds (default: 300)")
+    parser.add_argument("--verbose", action="store_true", help="Show the bot's log output")
+    parser.add_argument("--json", help="Write the machine-readable report here")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(json.loads(args.child))
+        return
+
+    scenarios = {name: SCENARIOS[name] for name in args.scenario or []}
+    custom = {"espn": {}, "bsky": {}}
+    for side in custom:
+        if getattr(args, f"{side}_delay") is not None:
+            custom[side]["delay"] = getattr(args, f"{side}_delay")
+        if getattr(args, f"{side}_errors") is not None:
+            custom[side]["error_rate"] = getattr(args, f"{side}_errors")
+    if custom["espn"] or custom["bsky"]:
+        scenarios["custom"] = custom
+    scenarios = scenarios or SCENARIOS
+
+    results = {}
+    for name, faults in scenarios.items():
+        runs = []
+        for seed in range(args.runs):
+            spec = {"espn": faults.get("espn", {}), "bsky": faults.get("bsky", {}), "seed": seed * 2,
+                    "mode": args.mode, "speed": args.speed, "start": args.start, "max_poll": args.max_poll,
+                    "interval": args.interval, "verbose": args.verbose}
+            runs.append(replay(spec))
+        results[name] = summarize(runs)
+
+    print(f"{'scenario':<10}{'posted':>8}{'dupes':>7}{'p50 s':>7}{'p90 s':>7}{'max s':>7}"
+          f"{'detect':>8}{'503s':>6}{'wall s':>8}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['posted']:>4}/{r['runs']:<3}{r['duplicates']:>7}{_fmt(r['p50_s']):>7}"
+              f"{_fmt(r['p90_s']):>7}{_fmt(r['max_s']):>7}{_fmt(r['detect_p50_s']):>8}"
+              f"{r['errors_injected']:>6.1f}{r['wall_s']:>8.1f}")
+        print("    requests/run: " + ", ".join(f"{e} {n:.1f}" for e, n in r["requests"].items()))
+    print("Latencies are match seconds from the final whistle; detect is when ESPN first showed it.")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"mode": args.mode, "speed": args.speed, "start": args.start, "scenarios": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Offline benchmark suite.
+
+Serves the fixtures in ``benchmarks/fixtures`` from a local ESPN stand-in
+and times summary parsing, fetch + parse, each drawing primitive and the
+full ``create_match_image`` for every fixture case.  Nothing touches the
+network.
+
+    python benchmarks/run.py --json before.json
+    python benchmarks/run.py --json after.json --compare before.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+from standin import FIXTURES, ESPNStandIn  # noqa: E402
+
+# Configuration is read at import time, so point the bot at the stand-in and
+# a throwaway cache before importing it.
+server = ESPNStandIn().start()
+os.environ["ESPN_BASE_URL"] = server.base_url
+os.environ["GUNNER_CACHE_DIR"] = tempfile.mkdtemp(prefix="gunner-bench-")
+
+import PIL  # noqa: E402
+
+from gunner_bot import rendering  # noqa: E402
+from gunner_bot.data import get_match_stats_espn  # noqa: E402
+from gunner_bot.summary import load_summary, parse_match_summary  # noqa: E402
+from primitives import CASES as PRIMITIVES, CANVAS  # noqa: E402
+
+
+def timed(fn, runs, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "runs": runs}
+
+
+def load_cases():
+    with open(os.path.join(FIXTURES, "cases.json")) as f:
+        cases = json.load(f)
+    payloads = {}
+    for name, match_id in cases.items():
+        with open(os.path.join(FIXTURES, "summaries", f"{match_id}.json")) as f:
+            payloads[name] = (match_id, f.read().replace("{{BASE}}", server.base_url))
+    return payloads
+
+
+def run(runs):
+    from PIL import Image
+    from gunner_bot.config import THEME
+
+    results = {}
+    cases = load_cases()
+
+    for name, (match_id, body) in cases.items():
+        results[f"parse/{name}"] = timed(lambda: parse_match_summary(load_summary(body), match_id), runs)
+        results[f"fetch+parse/{name}"] = timed(lambda: get_match_stats_espn(match_id), runs)
+
+    for name, (_before, after, args) in PRIMITIVES.items():
+        base = Image.new("RGB", CANVAS, THEME["BG"])
+        results[f"primitive/{name}"] = timed(lambda: after(base.copy(), *args), runs)
+
+    for name, (match_id, _body) in cases.items():
+        stats = get_match_stats_espn(match_id)
+        results[f"render/{name}"] = timed(lambda: rendering.create_match_image(stats), runs)
+    results["render/all_formats"] = timed(lambda: rendering.create_match_images(stats), runs)
+
+    def cold_render():
+        rendering._templates.clear()
+        for f in os.listdir(rendering.TEMPLATE_DIR):
+            os.remove(os.path.join(rendering.TEMPLATE_DIR, f))
+        rendering.create_match_image(stats)
+    results["render/cold_template"] = timed(cold_render, max(runs // 4, 3))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Gunner Bot benchmarks.")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--json", help="Write the machine-readable report here")
+    parser.add_argument("--compare", help="Earlier report to compare medians against")
+    args = parser.parse_args()
+
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+
+    report = {
+        "meta": {
+            "commit": git_revision(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+        },
+        "results": run(args.runs),
+    }
+    server.stop()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{'benchmark':<34}{'median ms':>11}{'min ms':>9}" + (f"{'baseline':>10}{'change':>9}" if baseline else ""))
+    for name, r in report["results"].items():
+        line = f"{name:<34}{r['median_ms']:>11.3f}{r['min_ms']:>9.3f}"
+        if name in baseline:
+            before = baseline[name]["median_ms"]
+            line += f"{before:>10.3f}{(r['median_ms'] - before) / before * 100:>+8.1f}%"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
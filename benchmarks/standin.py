@@ -0,0 +1,206 @@
+"""Local HTTP stand-ins for the ESPN site API and the Bluesky XRPC API.
+
+``ESPNStandIn`` serves ``benchmarks/fixtures``; routes mirror the paths
+under ``ESPN_BASE_URL``::
+
+    /<league>/teams/<team>/schedule   -> fixtures/schedules/<league>.json
+    /<league>/summary?event=<id>      -> fixtures/summaries/<id>.json
+    /<league>/scoreboard              -> empty scoreboard
+    /crests/<team>.png                -> fixtures/crests/<team>.png
+
+Responses carry an ETag and honour ``If-None-Match`` so the HTTP cache's
+revalidation path is exercised too.
+
+``BlueskyStandIn`` implements the four XRPC methods the bot calls
+(``createSession``/``refreshSession``, ``getAuthorFeed``, ``uploadBlob`` and
+``createRecord``) under ``BSKY_BASE_URL``, keeping posts in memory.
+
+Both can inject faults: ``delay`` seconds before every response and an
+``error_rate`` share of 503s (drawn from a seeded RNG), returned before any
+work is done.
+"""
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _BaseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="application/json"):
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _faulted(self):
+        """Count the request and apply the server's faults; True if it got a 503."""
+        path = urlparse(self.path).path
+        self.server.count(self.path)
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self.server.inject(path):
+            self._send(503, b'{"error": "ServiceUnavailable"}')
+            return True
+        return False
+
+
+class _StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler, delay=0.0, error_rate=0.0, seed=0):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.base_url = f"http://127.0.0.1:{self.server_port}"
+        self.delay = delay
+        self.error_rate = error_rate
+        self.requests = {}
+        self.errors = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def count(self, path):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def inject(self, path):
+        with self._lock:
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.errors[path] = self.errors.get(path, 0) + 1
+                return True
+        return False
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(_BaseHandler):
+    server_version = "ESPNStandIn/1.0"
+
+    def _fixture(self, *parts):
+        path = os.path.join(self.server.fixtures, *parts)
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        if path.endswith(".json"):
+            body = body.replace(b"{{BASE}}", self.server.base_url.encode())
+        return body
+
+    def _route(self, url, parts):
+        """Return the body for a GET (None for 404) and its content type."""
+        if parts[0] == "crests" and len(parts) == 2:
+            return self._fixture("crests", parts[1]), "image/png"
+        if len(parts) == 4 and parts[1] == "teams" and parts[3] == "schedule":
+            return self._fixture("schedules", f"{parts[0]}.json") or b'{"events": []}', "application/json"
+        if len(parts) == 2 and parts[1] == "summary":
+            event = parse_qs(url.query).get("event", [""])[0]
+            return self._fixture("summaries", f"{event}.json"), "application/json"
+        if len(parts) == 2 and parts[1] == "scoreboard":
+            return b'{"events": []}', "application/json"
+        return None, "application/json"
+
+    def do_GET(self):
+        if self._faulted():
+            return
+        url = urlparse(self.path)
+        body, content_type = self._route(url, url.path.strip("/").split("/"))
+        if body is None:
+            self._send(404, b'{"code": 404}')
+        else:
+            self._send(200, body, content_type)
+
+
+class ESPNStandIn(_StandIn):
+    def __init__(self, fixtures=FIXTURES, handler=_Handler, **faults):
+        super().__init__(handler, **faults)
+        self.fixtures = fixtures
+
+
+def _jwt(claims):
+    def part(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+    return f"{part({'alg': 'none'})}.{part(claims)}.sig"
+
+
+class _XRPCHandler(_BaseHandler):
+    server_version = "XRPCStandIn/1.0"
+
+    def _json(self, obj, status=200):
+        self._send(status, json.dumps(obj).encode())
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _session(self):
+        exp = int(time.time()) + 7200
+        return {"did": self.server.did, "handle": self.server.handle,
+                "accessJwt": _jwt({"sub": self.server.did, "exp": exp}),
+                "refreshJwt": _jwt({"sub": self.server.did, "exp": exp + 86400})}
+
+    def do_GET(self):
+        if self._faulted():
+            return
+        if urlparse(self.path).path == "/xrpc/app.bsky.feed.getAuthorFeed":
+            with self.server.lock:
+                feed = [{"post": post} for post in reversed(self.server.posts)]
+            self._json({"feed": feed})
+        else:
+            self._send(404, b'{"error": "MethodNotImplemented"}')
+
+    def do_POST(self):
+        body = self._body()
+        if self._faulted():
+            return
+        path = urlparse(self.path).path
+        if path in ("/xrpc/com.atproto.server.createSession", "/xrpc/com.atproto.server.refreshSession"):
+            self._json(self._session())
+        elif path == "/xrpc/com.atproto.repo.uploadBlob":
+            self._json({"blob": {"$type": "blob", "ref": {"$link": hashlib.sha256(body).hexdigest()},
+                                 "mimeType": self.headers.get("Content-Type"), "size": len(body)}})
+        elif path == "/xrpc/com.atproto.repo.createRecord":
+            record = json.loads(body)["record"]
+            with self.server.lock:
+                uri = f"at://{self.server.did}/app.bsky.feed.post/{len(self.server.posts) + 1}"
+                self.server.posts.append({"uri": uri, "record": record})
+                self.server.on_post(uri, record)
+            self._json({"uri": uri, "cid": hashlib.sha1(uri.encode()).hexdigest()})
+        else:
+            self._send(404, b'{"error": "MethodNotImplemented"}')
+
+
+class BlueskyStandIn(_StandIn):
+    """In-memory XRPC server for one account.  ``on_post(uri, record)`` runs for each new post."""
+
+    def __init__(self, handler=_XRPCHandler, handle="replay.test", **faults):
+        super().__init__(handler, **faults)
+        self.handle = handle
+        self.did = "did:plc:replay"
+        self.posts = []
+        self.lock = threading.Lock()
+        self.on_post = lambda uri, record: None
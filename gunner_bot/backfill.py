@@ -0,0 +1,120 @@
+"""Render cards for every completed fixture of a season, without posting.
+
+    python -m gunner_bot.backfill --out cards/ [--season 2024] [--league eng.1]
+
+Match IDs come from the merged league schedules, summaries are fetched
+concurrently, and cards are rendered in a process pool across all cores as
+soon as their stats arrive.  Output is ``<out>/<date>_<match id>.<ext>``
+for the card and ``<date>_<match id>_<layout>.<ext>`` for any other
+``--layout``; matches whose files all exist are skipped, so an interrupted
+run can be restarted.
+"""
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from .config import IMAGE_FORMAT, LEAGUES
+from .data import fetch_league_schedules, get_match_stats_espn
+from .encoding import ENCODERS, encode_image
+from .rendering import FORMATS, create_match_images
+
+log = logging.getLogger(__name__)
+
+SUMMARY_WORKERS = 8
+
+
+def completed_fixtures(leagues, season=None):
+    """Return ``{match_id: event}`` for every completed fixture in ``leagues``."""
+    fixtures = {}
+    for league, events in fetch_league_schedules(leagues, season=season):
+        for e in events:
+            try:
+                if e['competitions'][0]['status']['type']['state'] == 'post':
+                    fixtures[e['id']] = e
+            except (KeyError, IndexError, TypeError):
+                log.warning("Skipping malformed %s event", league)
+    return fixtures
+
+
+def _output_paths(out_dir, event, ext, layouts):
+    stem = f"{event['date'][:10]}_{event['id']}"
+    return {layout: os.path.join(out_dir, f"{stem}.{ext}" if layout == "card" else f"{stem}_{layout}.{ext}")
+            for layout in layouts}
+
+
+def render_card(stats, paths, fmt):
+    """Render and write one match in every layout in ``paths`` (runs in a worker process)."""
+    images = create_match_images(stats, tuple(paths))
+    for layout, path in paths.items():
+        data, _mime = encode_image(images[layout], fmt)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return ", ".join(paths.values())
+
+
+def backfill(out_dir, leagues=LEAGUES, season=None, fmt=IMAGE_FORMAT, workers=None, layouts=("card",)):
+    """Render every missing card into ``out_dir``; return ``(rendered, skipped, failed)``."""
+    os.makedirs(out_dir, exist_ok=True)
+    ext = ENCODERS[fmt][1].split("/")[1]
+
+    fixtures = completed_fixtures(leagues, season)
+    todo = {mid: e for mid, e in fixtures.items()
+            if not all(os.path.exists(p) for p in _output_paths(out_dir, e, ext, layouts).values())}
+    skipped = len(fixtures) - len(todo)
+    log.info("%d completed fixtures, %d already rendered, %d to do", len(fixtures), skipped, len(todo))
+
+    rendered = failed = 0
+    with ThreadPoolExecutor(max_workers=SUMMARY_WORKERS) as fetchers, \
+            ProcessPoolExecutor(max_workers=workers) as renderers:
+        summaries = {fetchers.submit(get_match_stats_espn, mid): mid for mid in todo}
+        renders = {}
+        for fut in as_completed(summaries):
+            mid = summaries[fut]
+            stats = fut.result()
+            if not stats:
+                log.warning("No stats for match %s", mid)
+                failed += 1
+                continue
+            paths = _output_paths(out_dir, todo[mid], ext, layouts)
+            renders[renderers.submit(render_card, stats, paths, fmt)] = mid
+
+        for fut in as_completed(renders):
+            try:
+                log.info("Rendered %s", fut.result())
+                rendered += 1
+            except Exception:
+                log.exception("Rendering match %s failed", renders[fut])
+                failed += 1
+
+    log.info("Backfill done: %d rendered, %d skipped, %d failed", rendered, skipped, failed)
+    return rendered, skipped, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gunner_bot.backfill",
+                                     description="Render cards for every completed fixture, without posting.")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--season", type=int, help="Season start year, e.g. 2024 for 2024-25 (default: current)")
+    parser.add_argument("--league", action="append", dest="leagues",
+                        help="League slug (repeatable, default: config.LEAGUES)")
+    parser.add_argument("--format", default=IMAGE_FORMAT, choices=sorted(ENCODERS))
+    parser.add_argument("--layout", action="append", dest="layouts", choices=sorted(FORMATS),
+                        help="Card layout (repeatable, default: card)")
+    parser.add_argument("--workers", type=int, help="Render processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    _, _, failed = backfill(args.out, args.leagues or LEAGUES, args.season, args.format, args.workers,
+                            args.layouts or ("card",))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,228 @@
+"""Local club crest store.
+
+Raw crests are stored content-addressed (``raw/<sha256>``) and an index maps
+each ESPN team ID to the URL and hash it was last fetched with.  Rendered
+variants (resized and outlined RGBA) are stored per
+``(crest hash, target_height, thickness)``, so a repeat opponent costs one
+PNG read and no network or filtering.  Pillow is only imported once a crest
+is decoded, so looking up or downloading crests stays cheap.
+
+Warm the store for every team in the configured leagues with::
+
+    python -m gunner_bot.badges
+"""
+import argparse
+import functools
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+
+from . import metrics
+from .cache import cached_get
+from .client import get_headers
+from .config import CACHE_DIR, ESPN_BASE_URL, LEAGUES
+
+log = logging.getLogger(__name__)
+
+BADGE_DIR = os.path.join(CACHE_DIR, "badges")
+INDEX_FILE = os.path.join(BADGE_DIR, "index.json")
+
+_index = None
+_index_lock = threading.Lock()
+_raw_fallback = {}  # sha -> bytes, used when the store is not writable
+_decoded = {}  # sha -> decoded RGBA crest, shared by every variant built
+_DECODED_MAX = 32
+
+
+def _raw_path(sha):
+    return os.path.join(BADGE_DIR, "raw", sha)
+
+
+def _variant_path(sha, target_height, thickness):
+    return os.path.join(BADGE_DIR, "variants", f"{sha}_{target_height}_{thickness}.png")
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_FILE) as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index():
+    try:
+        os.makedirs(BADGE_DIR, exist_ok=True)
+        tmp = f"{INDEX_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(_index, f)
+        os.replace(tmp, INDEX_FILE)
+    except OSError as e:
+        log.warning("Could not save badge index: %s", e)
+
+
+def fetch_crest(team_id, url):
+    """Return the content hash of ``team_id``'s crest, downloading it if needed.
+
+    The hash is the key for ``get_variant``.  Returns None if the crest cannot
+    be fetched.
+    """
+    if not url:
+        return None
+    team_id = str(team_id)
+    with _index_lock:
+        entry = _load_index().get(team_id)
+    if entry and entry["url"] == url and (entry["sha"] in _raw_fallback or os.path.exists(_raw_path(entry["sha"]))):
+        return entry["sha"]
+
+    try:
+        with metrics.stage("logo"):
+            r = cached_get(url, "logo", headers=get_headers())
+    except Exception as e:
+        log.warning("Crest download failed for team %s: %s", team_id, e)
+        return None
+    if r.status_code != 200:
+        log.warning("Crest for team %s returned HTTP %d", team_id, r.status_code)
+        return None
+
+    sha = hashlib.sha256(r.content).hexdigest()
+    try:
+        os.makedirs(os.path.dirname(_raw_path(sha)), exist_ok=True)
+        if not os.path.exists(_raw_path(sha)):
+            with open(_raw_path(sha), "wb") as f:
+                f.write(r.content)
+    except OSError as e:
+        log.warning("Could not store crest %s: %s", sha[:12], e)
+        _raw_fallback[sha] = r.content
+
+    with _index_lock:
+        _load_index()[team_id] = {"url": url, "sha": sha}
+        _save_index()
+    return sha
+
+
+def load_crest(sha):
+    """Decode the raw crest stored under ``sha`` as RGBA, or None.
+
+    Decoded crests are kept in memory, so building several sizes of one
+    crest (one per card format) decodes it once.  Callers must not modify
+    the returned image.
+    """
+    crest = _decoded.get(sha)
+    if crest is not None:
+        return crest
+    from PIL import Image
+
+    content = _raw_fallback.get(sha)
+    if content is None:
+        try:
+            with open(_raw_path(sha), "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+    try:
+        crest = Image.open(io.BytesIO(content)).convert("RGBA")
+    except Exception:
+        log.warning("Stored crest %s is not a readable image", sha[:12])
+        return None
+    if len(_decoded) >= _DECODED_MAX:
+        _decoded.clear()
+    _decoded[sha] = crest
+    return crest
+
+
+@functools.lru_cache(maxsize=32)
+def _read_variant(path):
+    from PIL import Image
+
+    with Image.open(path) as im:
+        return im.convert("RGBA")
+
+
+def forget_variants():
+    """Drop the decoded crests and variants held in memory (the files stay on disk)."""
+    _read_variant.cache_clear()
+    _decoded.clear()
+
+
+def get_variant(sha, target_height, thickness, build):
+    """Return the rendered crest variant, building and storing it on a miss.
+
+    ``build(raw_rgba, target_height, thickness)`` produces the variant from the
+    decoded crest; it only runs the first time a variant is requested.
+    Recently used variants stay decoded in memory; callers must not modify
+    the returned image.
+    """
+    path = _variant_path(sha, target_height, thickness)
+    try:
+        return _read_variant(path)
+    except (OSError, ValueError):
+        pass
+
+    raw = load_crest(sha)
+    if raw is None:
+        return None
+    variant = build(raw, target_height, thickness)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        variant.save(tmp, format="PNG")
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("Could not store crest variant %s: %s", os.path.basename(path), e)
+    return variant
+
+
+def _league_teams(league):
+    url = f"{ESPN_BASE_URL}/{league}/teams"
+    r = cached_get(url, "schedule", headers=get_headers())
+    if r.status_code != 200:
+        log.warning("ESPN teams %s returned HTTP %d", league, r.status_code)
+        return []
+    leagues = r.json().get("sports", [{}])[0].get("leagues", [{}])
+    return [t["team"] for t in leagues[0].get("teams", [])] if leagues else []
+
+
+def warm(leagues=LEAGUES, sizes=((180, 4),)):
+    """Fill the store with every team's crest and the variants in ``sizes``."""
+    from .rendering import build_logo_variant
+
+    teams = {}
+    for league in leagues:
+        try:
+            for team in _league_teams(league):
+                if team.get("logos"):
+                    teams[team["id"]] = team["logos"][0]["href"]
+        except Exception:
+            log.exception("Failed to list %s teams", league)
+
+    stored = 0
+    for team_id, url in teams.items():
+        sha = fetch_crest(team_id, url)
+        if sha is None:
+            continue
+        for target_height, thickness in sizes:
+            get_variant(sha, target_height, thickness, build_logo_variant)
+        stored += 1
+    log.info("Badge store warm: %d/%d teams across %d leagues", stored, len(teams), len(leagues))
+    return stored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gunner_bot.badges",
+                                     description="Warm the local club crest store.")
+    parser.add_argument("--league", action="append", dest="leagues",
+                        help="League slug to warm (repeatable, default: config.LEAGUES)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    warm(args.leagues or LEAGUES)
+
+
+if __name__ == "__main__":
+    main()
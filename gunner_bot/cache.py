@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from . import metrics
+from .config import CACHE_DIR, CACHE_TTL
+
+log = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+
+_stats = {"hit": 0, "revalidated": 0, "miss": 0}
+_stats_lock = threading.Lock()
+
+
+class CachedResponse:
+    """The subset of ``requests.Response`` that callers of ``cached_get`` use."""
+
+    def __init__(self, status_code, content, from_cache=False):
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def _paths(url):
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, key + ".json"), os.path.join(HTTP_CACHE_DIR, key + ".body")
+
+
+def _load(url):
+    meta_path, body_path = _paths(url)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+        # The metadata file's mtime is when the entry was last known fresh;
+        # a 304 just touches it instead of rewriting anything.
+        meta["stored_at"] = os.stat(meta_path).st_mtime
+    except (OSError, ValueError):
+        return None, None
+    if meta.get("url") != url:
+        return None, None
+    return meta, body
+
+
+def _write_atomic(path, data, mode):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, mode) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _store(url, meta, body):
+    meta_path, body_path = _paths(url)
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        _write_atomic(body_path, body, "wb")
+        _write_atomic(meta_path, json.dumps(meta), "w")
+    except OSError as e:
+        log.warning("Could not write HTTP cache entry for %s: %s", url, e)
+
+
+def _touch(url):
+    try:
+        os.utime(_paths(url)[0])
+    except OSError as e:
+        log.warning("Could not refresh HTTP cache entry for %s: %s", url, e)
+
+
+def cached_get(url, kind, headers=None, timeout=None, transport=None):
+    """GET ``url`` through the on-disk response cache.
+
+    ``kind`` selects the freshness lifetime from ``CACHE_TTL``.  A fresh entry
+    is returned without touching the network; a stale one is revalidated with
+    ``If-None-Match`` / ``If-Modified-Since`` so an unchanged resource costs a
+    304.  Only 200 responses are stored.  ``timeout`` defaults to the host's
+    limit in ``client.HOST_LIMITS``.  Bytes downloaded are reported to
+    ``metrics`` under ``kind``.
+
+    ``transport(url, headers=, timeout=)`` replaces the shared client; it
+    must return an object with ``status_code``, ``headers`` and ``content``.
+    """
+    meta, body = _load(url)
+    if meta is not None and time.time() - meta["stored_at"] < CACHE_TTL.get(kind, 0):
+        _count("hit")
+        return CachedResponse(200, body, from_cache=True)
+
+    req_headers = dict(headers or {})
+    if meta is not None:
+        if meta.get("etag"):
+            req_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            req_headers["If-Modified-Since"] = meta["last_modified"]
+
+    if transport is None:
+        # Imported here so the stdlib-only scheduler can use this module.
+        from .client import request
+        r = request("GET", url, headers=req_headers, timeout=timeout, stage=kind)
+    else:
+        r = transport(url, headers=req_headers, timeout=timeout)
+
+    if r.status_code == 304 and meta is not None:
+        _count("revalidated")
+        _touch(url)
+        return CachedResponse(200, body, from_cache=True)
+
+    _count("miss")
+    metrics.add_bytes(kind, len(r.content))
+    if r.status_code == 200:
+        _store(url, {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }, r.content)
+    return CachedResponse(r.status_code, r.content)
+
+
+def get_cache_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def log_cache_stats():
+    s = get_cache_stats()
+    log.info("HTTP cache: %d hits, %d revalidated (304), %d misses",
+             s["hit"], s["revalidated"], s["miss"])
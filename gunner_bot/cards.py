@@ -0,0 +1,163 @@
+"""Memoized card output.
+
+A card is a pure function of the match record, the theme, the layout, the
+encoder and the renderer code, so ``render_card`` hashes those and keeps
+the encoded bytes under CARD_DIR.  A retry after a failed upload, or a
+poll where ESPN's data has not changed, reuses the stored card without
+rendering, encoding or even importing Pillow.
+
+The store is an LRU bounded by ``CARD_CACHE_MAX_BYTES``: a hit refreshes
+the file's mtime and the oldest files are evicted after each write.
+"""
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from . import metrics
+from .config import CACHE_DIR, CARD_CACHE_MAX_BYTES, IMAGE_FORMAT, THEME
+from .fonts import resolve_font_path
+
+log = logging.getLogger(__name__)
+
+CARD_DIR = os.path.join(CACHE_DIR, "cards")
+
+# Changes to these sources change every key, so a code update never reuses
+# a card drawn by the previous renderer.
+_RENDERER_SOURCES = ["rendering.py", "fonts.py", "encoding.py"]
+
+# File extension -> MIME type of the encoders' output.
+_MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+_stats = {"hit": 0, "miss": 0}
+_stats_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _renderer_fingerprint():
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _RENDERER_SOURCES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    digest.update(str(resolve_font_path()).encode())
+    return digest.hexdigest()
+
+
+def card_key(stats, theme=THEME, fmt=IMAGE_FORMAT, layout="card"):
+    """Return the stable hash of everything that decides the encoded card."""
+    inputs = {
+        "record": stats.as_dict(),
+        "theme": theme,
+        "format": fmt,
+        "layout": layout,
+        "renderer": _renderer_fingerprint(),
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def _load(key):
+    for ext, mime in _MIME_TYPES.items():
+        path = os.path.join(CARD_DIR, f"{key}.{ext}")
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data, mime
+    return None
+
+
+def _evict():
+    try:
+        entries = []
+        for name in os.listdir(CARD_DIR):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(CARD_DIR, name)
+            st = os.stat(path)
+            entries.append((st.st_mtime, st.st_size, path))
+    except OSError:
+        return
+    total = sum(size for _mtime, size, _path in entries)
+    for _mtime, size, path in sorted(entries):
+        if total <= CARD_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _store(key, data, mime):
+    path = os.path.join(CARD_DIR, f"{key}.{mime.split('/')[1]}")
+    try:
+        os.makedirs(CARD_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("Could not store card %s: %s", key[:12], e)
+        return
+    _evict()
+
+
+def render_card(stats, theme=THEME, fmt=IMAGE_FORMAT, layout="card"):
+    """Return ``(bytes, mime_type)`` for the card of ``stats`` (a ``MatchRecord``).
+
+    Served from the card store when the same inputs were rendered before;
+    otherwise rendered, encoded and stored.  Render and encode time are
+    reported to ``metrics`` only when the work is actually done.
+    """
+    key = card_key(stats, theme, fmt, layout)
+    cached = _load(key)
+    if cached is not None:
+        _count("hit")
+        log.info("Card cache hit %s: reusing the %d-byte card vs %s", key[:12], len(cached[0]), stats.opponent)
+        return cached
+    _count("miss")
+
+    from .encoding import encode_image
+    from .rendering import create_match_image
+
+    with metrics.stage("render"):
+        img = create_match_image(stats, theme, layout)
+    with metrics.stage("encode"):
+        data, mime = encode_image(img, fmt)
+    metrics.add_bytes("encode", len(data))
+    _store(key, data, mime)
+    return data, mime
+
+
+def get_card_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def take_card_stats():
+    """Return the hit/miss counts so far and reset them (for worker processes)."""
+    with _stats_lock:
+        counts = dict(_stats)
+        for outcome in _stats:
+            _stats[outcome] = 0
+    return counts
+
+
+def add_card_stats(counts):
+    """Add hit/miss counts from ``take_card_stats`` in another process."""
+    with _stats_lock:
+        for outcome, n in counts.items():
+            _stats[outcome] += n
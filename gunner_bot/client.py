@@ -0,0 +1,218 @@
+"""Shared HTTP client for ESPN and Bluesky.
+
+Every outbound request goes through ``request``, which adds to the pooled
+keep-alive session:
+
+* per-host timeouts, concurrency and request-rate caps (``HOST_LIMITS``);
+* retries with jittered exponential backoff on connection errors,
+  truncated bodies, 429 and 5xx, honouring ``Retry-After``;
+* a per-host circuit breaker: after ``BREAKER_THRESHOLD`` consecutive
+  failures the host is failed fast with ``CircuitOpenError`` for
+  ``BREAKER_COOLDOWN`` seconds, then one trial request is let through.
+
+Non-idempotent requests (POST unless the caller says otherwise) are only
+retried on 429, which the server sends before doing any work, so a
+half-finished ``createRecord`` is never repeated.
+"""
+import email.utils
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+# Enough connections for every league schedule to be in flight at once.
+POOL_SIZE = 16
+
+# host -> (connect, read) timeout, max requests in flight, max request starts
+# per second (None: unlimited).  Hosts not listed use "default".
+HOST_LIMITS = {
+    "default": {"timeout": (5, 30), "concurrency": 8, "rate": None},
+    "site.api.espn.com": {"timeout": (3.05, 10), "concurrency": POOL_SIZE, "rate": None},
+    "bsky.social": {"timeout": (5, 30), "concurrency": 4, "rate": 10},
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Transport failures worth another attempt (for idempotent requests).
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8
+# A Retry-After longer than this is not waited out; the response is returned.
+MAX_RETRY_AFTER = 60
+
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30
+
+_session = None
+_session_lock = threading.Lock()
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host that keeps failing."""
+
+
+class _Host:
+    def __init__(self, limits):
+        self.timeout = limits["timeout"]
+        self.slots = threading.BoundedSemaphore(limits["concurrency"])
+        self.interval = 1 / limits["rate"] if limits["rate"] else 0
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def wait_turn(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def check(self, name):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if self.probing or time.monotonic() - self.opened_at < BREAKER_COOLDOWN:
+                raise CircuitOpenError(f"{name} is failing; requests are paused")
+            # Half-open: this request is the trial.
+            self.probing = True
+
+    def succeeded(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failed(self, name):
+        with self.lock:
+            self.probing = False
+            self.failures += 1
+            if self.failures >= BREAKER_THRESHOLD:
+                if self.opened_at is None:
+                    log.warning("%s failed %d times in a row; circuit open for %ds", name, self.failures, BREAKER_COOLDOWN)
+                self.opened_at = time.monotonic()
+
+
+def get_headers():
+    return {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+
+
+def get_session():
+    """Return the process-wide pooled HTTP session.
+
+    ``requests.Session`` keeps connections alive between calls, so the
+    per-league ESPN requests share TLS connections instead of each opening
+    its own.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def _host(name):
+    with _hosts_lock:
+        host = _hosts.get(name)
+        if host is None:
+            host = _hosts[name] = _Host(HOST_LIMITS.get(name, HOST_LIMITS["default"]))
+        return host
+
+
+def _retry_after(resp):
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(when.timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt):
+    # "Full jitter": uniform over the exponential window.
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def request(method, url, timeout=None, retries=MAX_RETRIES, idempotent=None, stage=None, **kwargs):
+    """Send a request through the shared session; return the final response.
+
+    ``timeout`` overrides the host's default.  ``idempotent`` defaults to
+    True for GET/HEAD and decides whether 5xx, connection errors and
+    truncated bodies are retried.  Retries are reported to ``metrics``
+    under ``stage``.  Raises ``CircuitOpenError`` while the host's breaker
+    is open, and the last ``requests`` exception when every attempt failed
+    in transport.
+    """
+    name = urlparse(url).hostname or ""
+    host = _host(name)
+    if idempotent is None:
+        idempotent = method.upper() in ("GET", "HEAD")
+
+    resp = None
+    for attempt in range(retries + 1):
+        try:
+            host.check(name)
+        except CircuitOpenError:
+            # Opened by our own retries: hand back the last failure instead.
+            if resp is not None:
+                return resp
+            raise
+        host.wait_turn()
+        try:
+            with host.slots:
+                resp = get_session().request(method, url, timeout=timeout or host.timeout, **kwargs)
+        except RETRY_ERRORS as e:
+            host.failed(name)
+            if not idempotent or attempt == retries:
+                raise
+            delay = _backoff(attempt)
+            log.info("%s %s failed (%s); retrying in %.1fs", method, name, e.__class__.__name__, delay)
+        except Exception:
+            # Any other failure still has to end a half-open trial, or the
+            # breaker would stay shut for the rest of the process.
+            host.failed(name)
+            raise
+        else:
+            if resp.status_code >= 500:
+                host.failed(name)
+            else:
+                host.succeeded()
+            if resp.status_code not in RETRY_STATUSES or attempt == retries:
+                return resp
+            if resp.status_code != 429 and not idempotent:
+                return resp
+            delay = _retry_after(resp)
+            if delay is None:
+                delay = _backoff(attempt)
+            elif delay > MAX_RETRY_AFTER:
+                return resp
+            log.info("%s %s returned HTTP %d; retrying in %.1fs", method, name, resp.status_code, delay)
+            resp.close()
+        if stage:
+            metrics.add_retry(stage)
+        time.sleep(delay)
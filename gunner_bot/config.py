@@ -1,3 +1,4 @@
+import json
 import os
 
 # --- Secrets ---
@@ -5,6 +6,27 @@ BSKY_HANDLE = os.environ.get("BSKY_HANDLE")
 BSKY_PASSWORD = os.environ.get("BSKY_PASSWORD")
 
 # --- Configuration ---
+# Local state that should survive between poll attempts (route memory, caches).
+CACHE_DIR = os.environ.get("GUNNER_CACHE_DIR", ".cache")
+
+# Bluesky session tokens, reused across runs (written with 0600 permissions).
+BSKY_SESSION_FILE = os.environ.get("BSKY_SESSION_FILE", os.path.join(CACHE_DIR, "bsky_session.json"))
+
+# Match IDs that have already been posted (SQLite).
+LEDGER_FILE = os.environ.get("GUNNER_LEDGER_FILE", os.path.join(CACHE_DIR, "posted.sqlite3"))
+
+# Searched first for the card font; fill it with `python -m gunner_bot.fonts`.
+FONT_DIR = os.environ.get("GUNNER_FONT_DIR", os.path.join(CACHE_DIR, "fonts"))
+
+# Per-run stage timings are appended here as JSON lines when set.
+METRICS_FILE = os.environ.get("GUNNER_METRICS_FILE") or None
+
+# ESPN site API root; point it at a local stand-in for offline benchmarks.
+ESPN_BASE_URL = os.environ.get("ESPN_BASE_URL", "https://site.api.espn.com/apis/site/v2/sports/soccer")
+
+# Bluesky PDS / XRPC root; point it at a local stand-in for replays.
+BSKY_BASE_URL = os.environ.get("BSKY_BASE_URL", "https://bsky.social")
+
 TEAM_ID_ESPN = 359  # Arsenal
 
 # All competitions Arsenal can appear in.
@@ -17,6 +39,39 @@ LEAGUES = [
     "eng.charity",        # Community Shield
 ]
 
+# Total time budget (seconds) for fetching every league schedule in parallel.
+SCHEDULE_DEADLINE = 15
+
+# Every fixture in LEAGUES, one row per ESPN event (SQLite).  A league's
+# schedule is only re-read once one of its fixtures has kicked off without
+# a result, or when its last full read (results plus upcoming fixtures) is
+# older than FIXTURES_MAX_AGE seconds.
+FIXTURES_FILE = os.environ.get("GUNNER_FIXTURES_FILE", os.path.join(CACHE_DIR, "fixtures.sqlite3"))
+FIXTURES_MAX_AGE = 6 * 3600
+
+# Summary fetch: the preferred endpoint gets a head start of SUMMARY_HEDGE_DELAY
+# seconds before the remaining endpoints are raced against it.
+SUMMARY_HEDGE_DELAY = 0.5
+SUMMARY_DEADLINE = 15
+
+# On-disk HTTP cache lifetime (seconds) per endpoint class.  Once an entry is
+# older than its TTL it is revalidated with ETag / Last-Modified, so a stale
+# but unchanged resource still only costs a 304.
+CACHE_TTL = {
+    "schedule": 120,
+    "scoreboard": 0,
+    "summary": 0,
+    "logo": 30 * 24 * 3600,
+}
+
+# Encoded cards are memoized on disk by input hash (see gunner_bot/cards.py);
+# the least recently used are evicted above this total size.
+CARD_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# Upload encoding for the card: png, png-fast, png-palette, jpeg or webp
+# (see gunner_bot/encoding.py; compare with `python -m gunner_bot.encoding`).
+IMAGE_FORMAT = os.environ.get("GUNNER_IMAGE_FORMAT", "png")
+
 # --- Visual Theme ---
 THEME = {
     "RED": "#EF0107",
@@ -30,3 +85,50 @@ THEME = {
     "RED_DIM": "#B80003",
     "RED_HI": "#FF2222",
 }
+
+# --- Teams ---
+# Caption placeholders: {team}, {team_score}, {opp_score}, {opponent}.
+CAPTION = "Full Time: Arsenal {team_score} - {opp_score} {opponent}. #COYG #Arsenal"
+
+# The single club configured above.  `python -m gunner_bot.teams` can post for
+# several clubs from one run: point GUNNER_TEAMS_FILE at a JSON list of entries
+# with the same keys.  "theme" may override only some colours; "handle_env"
+# and "password_env" name the environment variables holding that account's
+# Bluesky credentials.  Session and ledger files default to .cache/teams/<key>/.
+DEFAULT_TEAM = {
+    "key": "arsenal",
+    "name": "Arsenal",
+    "team_id": TEAM_ID_ESPN,
+    "leagues": LEAGUES,
+    "theme": THEME,
+    "caption": CAPTION,
+    "handle_env": "BSKY_HANDLE",
+    "password_env": "BSKY_PASSWORD",
+    "session_file": BSKY_SESSION_FILE,
+    "ledger_file": LEDGER_FILE,
+}
+
+TEAMS_FILE = os.environ.get("GUNNER_TEAMS_FILE")
+
+
+def _load_teams(path):
+    with open(path) as f:
+        entries = json.load(f)
+    teams = []
+    for entry in entries:
+        team_dir = os.path.join(CACHE_DIR, "teams", entry["key"])
+        teams.append(dict(
+            entry,
+            team_id=int(entry["team_id"]),
+            leagues=entry.get("leagues", LEAGUES),
+            theme={**THEME, **entry.get("theme", {})},
+            caption=entry.get("caption", "Full Time: {team} {team_score} - {opp_score} {opponent}."),
+            handle_env=entry.get("handle_env", "BSKY_HANDLE"),
+            password_env=entry.get("password_env", "BSKY_PASSWORD"),
+            session_file=entry.get("session_file", os.path.join(team_dir, "bsky_session.json")),
+            ledger_file=entry.get("ledger_file", os.path.join(team_dir, "posted.sqlite3")),
+        ))
+    return teams
+
+
+TEAMS = _load_teams(TEAMS_FILE) if TEAMS_FILE else [DEFAULT_TEAM]
@@ -0,0 +1,154 @@
+"""Resident poller: ``python -m gunner_bot``.
+
+Replaces the workflow's ``while … python app.py; sleep 300`` loop.  One
+process keeps the pooled HTTP session, the Bluesky session and every
+in-memory cache for the whole polling window.  It watches the fixture's
+live status on the league scoreboard, lets ``polling`` decide when to look
+again, and only runs the full detect → render → post pipeline once the
+state is ``post`` (or when the fixture cannot be found on any scoreboard).
+Before the first status read it runs ``prefetch`` so crests, fonts and
+templates are ready by full time; a postponed or cancelled fixture discards
+that work and ends the run with exit code 3.  Otherwise exit codes match
+``app.py``: 0 once the result is posted, else the code of the last attempt
+(1 error, 2 nothing to do).
+
+ESPN does not timestamp the final whistle, so the run metrics bound it: it
+went between the last poll that saw the match live and the first that saw
+it finished.  ``whistle_to_post_s`` is measured from the latter and
+``whistle_to_post_max_s`` from the former.
+"""
+import argparse
+import datetime
+import logging
+import time
+
+from . import cards, metrics, prefetch
+from .cache import get_cache_stats, log_cache_stats
+from .config import LEAGUES
+from .data import get_live_status
+from .polling import CANCELLED_STATUSES, error_retry_delay, next_poll_delay, predict_final_whistle
+from .publishing import get_bluesky_session, log_session_stats
+from .runner import CANCELLED, ERROR, NOTHING_TO_DO, POSTED, run_once
+
+log = logging.getLogger(__name__)
+
+
+def _read_status(leagues):
+    try:
+        return get_live_status(leagues)
+    except Exception:
+        log.exception("Could not read live status")
+        return None
+
+
+def _record_whistle_to_post(last_live, first_post):
+    posted = datetime.datetime.now(datetime.timezone.utc)
+    if first_post is not None:
+        metrics.set_value("whistle_seen_at", first_post.isoformat())
+        metrics.set_value("whistle_to_post_s", round((posted - first_post).total_seconds(), 1))
+    if last_live is not None:
+        metrics.set_value("last_live_at", last_live.isoformat())
+        metrics.set_value("whistle_to_post_max_s", round((posted - last_live).total_seconds(), 1))
+
+
+def poll(max_poll, interval):
+    session = get_bluesky_session()
+    if not session:
+        log.warning("Could not authenticate with Bluesky. Will run in DRY RUN mode.")
+
+    deadline = time.monotonic() + max_poll
+    leagues = LEAGUES
+    try:
+        prepared = prefetch.prefetch(leagues)
+    except Exception:
+        log.exception("Prefetch failed; continuing cold")
+        prepared = None
+    status_polls = attempts = failures = 0
+    last_live = first_post = None
+    code = NOTHING_TO_DO
+    while True:
+        status = _read_status(leagues)
+        status_polls += 1
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if status:
+            # Once the fixture is found only its own scoreboard needs watching.
+            leagues = [status["league"]]
+            log.info("Live status: %s (%s, period %s)", status["state"], status["detail"], status["period"])
+            if status.get("name") in CANCELLED_STATUSES:
+                log.warning("Match %s is %s; nothing to post.", status["id"], status["detail"])
+                if prepared:
+                    prefetch.discard()
+                return CANCELLED
+            if prepared and prepared["id"] != status["id"]:
+                prefetch.discard()
+                prepared = None
+            if status["state"] == "in":
+                last_live = now
+                whistle = predict_final_whistle(status, now)
+                if whistle is not None:
+                    metrics.set_value("predicted_whistle", whistle.isoformat())
+            elif status["state"] == "post" and first_post is None:
+                first_post = now
+        elif leagues != LEAGUES:
+            leagues = LEAGUES
+
+        delay = next_poll_delay(status, now, interval)
+        if status is None or status["state"] == "post":
+            attempts += 1
+            log.info("--- Poll attempt %d ---", attempts)
+            # The access token may have expired during a long wait (while it
+            # is still valid this is just a file read), and a login that
+            # failed earlier is tried again so a brief Bluesky outage does not
+            # turn the whole window into a dry run.  Without credentials this
+            # returns None straight away.
+            session = get_bluesky_session() or session
+            code = run_once(session, match_id=status["id"] if status else None)
+            metrics.set_value("attempts", attempts)
+            metrics.set_value("status_polls", status_polls)
+            if code == POSTED:
+                log.info("Successfully posted after %d attempt(s), %d status check(s).", attempts, status_polls)
+                _record_whistle_to_post(last_live, first_post)
+                return code
+            failures = failures + 1 if code == ERROR else 0
+            # A lagging summary is worth retrying soon; repeated errors back
+            # off to ``interval`` and anything else waits.
+            delay = interval if code == NOTHING_TO_DO else max(delay, error_retry_delay(failures, interval))
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        delay = min(delay, remaining)
+        log.info("Next check in %ds.", delay)
+        time.sleep(delay)
+
+    log.warning("Poll window of %ds ended without posting (last exit %d).", max_poll, code)
+    return code
+
+
+def _finish(code):
+    metrics.set_value("exit_code", code)
+    metrics.set_value("http_cache", get_cache_stats())
+    metrics.set_value("card_cache", cards.get_card_stats())
+    metrics.write_summary()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gunner_bot", description="Poll for the result and post it.")
+    parser.add_argument("--max-poll", type=int, default=10800, help="Polling window in seconds (default: 3h)")
+    parser.add_argument("--interval", type=int, default=300,
+                        help="Seconds between attempts when the fixture is not on a scoreboard (default: 300)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    code = ERROR
+    try:
+        code = poll(args.max_poll, args.interval)
+        return code
+    finally:
+        log_cache_stats()
+        log_session_stats()
+        _finish(code)
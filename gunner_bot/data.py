@@ -1,174 +1,300 @@
-import io
+import datetime
+import functools
+import json
 import logging
-import requests
-from PIL import Image
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
-from .config import TEAM_ID_ESPN, LEAGUES
+from . import fixtures, metrics
+from .cache import cached_get
+from .client import get_headers
+from .config import (
+    CACHE_DIR, ESPN_BASE_URL, TEAM_ID_ESPN, LEAGUES,
+    SCHEDULE_DEADLINE, SUMMARY_DEADLINE, SUMMARY_HEDGE_DELAY,
+)
+from .polling import CANCELLED_STATUSES
+from .summary import load_summary, parse_match_summary
 
 log = logging.getLogger(__name__)
 
 
-def get_headers():
-    return {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+def _schedule_url(league, season=None, fixture=False):
+    url = f"{ESPN_BASE_URL}/{league}/teams/{TEAM_ID_ESPN}/schedule"
+    if season:
+        url += f"?season={season}"
+    elif fixture:
+        url += "?fixture=true"
+    return url
 
 
-def get_image_from_url(url):
-    if not url:
-        return None
+def _fetch_league_schedule(league, timeout, season=None):
+    r = cached_get(_schedule_url(league, season), "schedule", headers=get_headers(), timeout=timeout)
+    if r.status_code != 200:
+        log.warning("ESPN schedule %s returned HTTP %d", league, r.status_code)
+        return []
+    return r.json().get('events', [])
+
+
+def _fan_out(fetch, leagues, deadline, what):
+    pool = ThreadPoolExecutor(max_workers=max(len(leagues), 1))
+    futures = {pool.submit(fetch, league, deadline): league for league in leagues}
     try:
-        r = requests.get(url, headers=get_headers(), timeout=10)
-        if r.status_code == 200:
-            return Image.open(io.BytesIO(r.content)).convert("RGBA")
-    except Exception:
+        for fut in as_completed(futures, timeout=deadline):
+            league = futures[fut]
+            try:
+                yield league, fut.result()
+            except Exception:
+                log.exception("Failed to fetch %s %s", league, what)
+    except TimeoutError:
+        pending = [league for fut, league in futures.items() if not fut.done()]
+        log.warning("%s deadline (%ss) reached, skipping: %s", what.capitalize(), deadline, ", ".join(pending))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_league_schedules(leagues=LEAGUES, deadline=SCHEDULE_DEADLINE, season=None):
+    """Fetch every league schedule in parallel, yielding ``(league, events)``.
+
+    All requests go out at once over the shared pooled session and results
+    are yielded in completion order.  ``deadline`` bounds the whole fan-out:
+    leagues that have not answered by then are logged and skipped, so one
+    slow endpoint cannot stall the poll.  ``season`` (e.g. ``2024`` for
+    2024-25) selects a past season instead of the current one.
+    """
+    fetch = functools.partial(_fetch_league_schedule, season=season) if season else _fetch_league_schedule
+    return _fan_out(fetch, leagues, deadline, "schedule")
+
+
+def _fetch_league_scoreboard(league, timeout, date=None):
+    url = f"{ESPN_BASE_URL}/{league}/scoreboard"
+    if date:
+        url += f"?dates={date}"
+    r = cached_get(url, "scoreboard", headers=get_headers(), timeout=timeout)
+    if r.status_code != 200:
+        log.warning("ESPN scoreboard %s returned HTTP %d", league, r.status_code)
+        return []
+    return r.json().get('events', [])
+
+
+def _crest_href(team):
+    # Scoreboards carry a bare ``logo`` URL; schedules and summaries a ``logos`` list.
+    return team.get('logo') or (team.get('logos') or [{}])[0].get('href')
+
+
+def _event_status(event, league):
+    competition = event['competitions'][0]
+    status = competition['status']
+    return {
+        "id": event['id'],
+        "league": league,
+        "date": event['date'],
+        "state": status['type']['state'],
+        "name": status['type'].get('name', ''),
+        "detail": status['type'].get('shortDetail', ''),
+        "period": status.get('period', 0),
+        "clock": status.get('clock', 0.0),
+        "crests": {c['id']: _crest_href(c.get('team', {})) for c in competition.get('competitors', [])},
+    }
+
+
+def get_live_status(leagues=LEAGUES, deadline=SCHEDULE_DEADLINE):
+    """Return the status of today's Arsenal fixture from the league scoreboards.
+
+    The result is a small dict (``id``, ``league``, ``date``, ``state``,
+    ``name``, ``detail``, ``period``, ``clock``, and ``crests`` mapping each
+    team ID to its crest URL) for the match that is in progress, or else
+    the one closest to kick-off.  Returns None if Arsenal do not appear on
+    any scoreboard.
+    """
+    team = str(TEAM_ID_ESPN)
+    found = []
+    with metrics.stage("scoreboard"):
+        for league, events in _fan_out(_fetch_league_scoreboard, leagues, deadline, "scoreboard"):
+            for e in events:
+                try:
+                    if any(c['id'] == team for c in e['competitions'][0]['competitors']):
+                        found.append(_event_status(e, league))
+                except (KeyError, IndexError, TypeError):
+                    log.warning("Malformed %s scoreboard event", league)
+    if not found:
         return None
+    order = {"in": 0, "pre": 1, "post": 2}
+    found.sort(key=lambda st: (order.get(st["state"], 3), st["date"]))
+    return found[0]
+
+
+def get_recent_results(team_leagues, days=3, deadline=SCHEDULE_DEADLINE):
+    """Return ``{team_id: match_id}`` with each team's latest completed fixture.
+
+    ``team_leagues`` maps ESPN team IDs to the leagues they play in.  Every
+    league involved is fetched once, as a scoreboard covering the last
+    ``days`` days, however many of the teams play in it.  Teams without a
+    completed fixture in that window are left out.
+    """
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    dates = f"{today - datetime.timedelta(days=days - 1):%Y%m%d}-{today:%Y%m%d}"
+    leagues = sorted({league for ls in team_leagues.values() for league in ls})
+    wanted = {str(team_id): set(ls) for team_id, ls in team_leagues.items()}
+
+    latest = {}  # team_id -> (date, match_id)
+    fetch = functools.partial(_fetch_league_scoreboard, date=dates)
+    with metrics.stage("scoreboard"):
+        for league, events in _fan_out(fetch, leagues, deadline, "scoreboard"):
+            for e in events:
+                try:
+                    status = e['competitions'][0]['status']['type']
+                    if status['state'] != 'post' or status.get('name') in CANCELLED_STATUSES:
+                        continue
+                    for c in e['competitions'][0]['competitors']:
+                        if league in wanted.get(c['id'], ()) and e['date'] > latest.get(c['id'], ("",))[0]:
+                            latest[c['id']] = (e['date'], e['id'])
+                except (KeyError, IndexError, TypeError):
+                    log.warning("Malformed %s scoreboard event", league)
+    return {team_id: match_id for team_id, (_date, match_id) in latest.items()}
+
+
+def _fetch_index_events(league, timeout, full):
+    # Results, plus upcoming fixtures on a full read.  Unlike
+    # _fetch_league_schedule an HTTP error raises, so the league is not
+    # marked as refreshed.
+    events = []
+    for fixture in (False, True) if full else (False,):
+        r = cached_get(_schedule_url(league, fixture=fixture), "schedule", headers=get_headers(), timeout=timeout)
+        if r.status_code != 200:
+            raise RuntimeError(f"ESPN schedule {league} returned HTTP {r.status_code}")
+        events.extend(r.json().get('events', []))
+    return events
+
+
+def refresh_fixture_index(leagues=LEAGUES, deadline=SCHEDULE_DEADLINE, now=None):
+    """Bring the local fixture index up to date, reading only the leagues that need it.
+
+    Queries each league individually because the ESPN ``/all/`` schedule
+    endpoint no longer returns data.  See ``fixtures.leagues_due`` for when a
+    league is re-read; the others cost no requests at all.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    due = fixtures.leagues_due(leagues, now)
+    if not due:
+        log.info("Fixture index is current; no schedules to read")
+        return
+
+    def fetch(league, timeout):
+        return _fetch_index_events(league, timeout, due[league])
+
+    for league, events in _fan_out(fetch, sorted(due), deadline, "schedule"):
+        n = fixtures.update(league, events, full=due[league], now=now)
+        log.info("  %s: %d fixtures indexed (%s read)", league, n, "full" if due[league] else "results")
 
 
 def get_last_fixture_espn():
     """Return the match ID of the most recently completed Arsenal fixture.
 
-    Queries every league in LEAGUES individually because the ESPN ``/all/``
-    schedule endpoint no longer returns data.  Results are merged and
-    deduplicated by match ID, then the most recent completed match is returned.
+    Refreshes the fixture index (see ``refresh_fixture_index``) and looks
+    the match up there.
     """
-    all_completed = {}  # id -> event, avoids duplicates
-
-    for league in LEAGUES:
-        url = f"https://site.api.espn.com/apis/site/v2/sports/soccer/{league}/teams/{TEAM_ID_ESPN}/schedule"
-        try:
-            r = requests.get(url, headers=get_headers(), timeout=10)
-            if r.status_code != 200:
-                log.warning("ESPN schedule %s returned HTTP %d", league, r.status_code)
-                continue
-            data = r.json()
-            events = data.get('events', [])
-            completed = [e for e in events if e['competitions'][0]['status']['type']['state'] == 'post']
-            log.info("  %s: %d completed matches", league, len(completed))
-            for e in completed:
-                all_completed[e['id']] = e
-        except Exception:
-            log.exception("Failed to fetch %s schedule", league)
-
-    if not all_completed:
+    with metrics.stage("schedule"):
+        refresh_fixture_index()
+        last = fixtures.last_completed()
+
+    if last is None:
         log.warning("No completed matches found across any league")
         return None
-
-    # Sort by date and return the most recent
-    sorted_matches = sorted(all_completed.values(), key=lambda x: x['date'])
-    last = sorted_matches[-1]
     log.info("Most recent match: %s (%s)", last['name'], last['date'])
-    return last['id']
-
-
-def get_match_stats_espn(match_id):
-    """Fetch full match statistics for a given ESPN match ID."""
-    # The /all/ summary endpoint still works, but we fall back to league-specific if it fails
-    urls_to_try = [
-        f"https://site.api.espn.com/apis/site/v2/sports/soccer/all/summary?event={match_id}",
-    ] + [
-        f"https://site.api.espn.com/apis/site/v2/sports/soccer/{league}/summary?event={match_id}"
-        for league in LEAGUES
-    ]
-
-    r_data = None
-    for url in urls_to_try:
-        try:
-            resp = requests.get(url, headers=get_headers(), timeout=10)
-            if resp.status_code == 200:
-                candidate = resp.json()
-                if candidate.get('header', {}).get('competitions'):
-                    r_data = candidate
-                    break
-        except Exception:
-            continue
+    return last['match_id']
+
+
+SUMMARY_ROUTES_FILE = os.path.join(CACHE_DIR, "summary_routes.json")
+SUMMARY_ROUTES_MAX = 50
 
-    if r_data is None:
-        log.error("Could not fetch summary for match %s from any endpoint", match_id)
-        return None
 
+def _summary_url(league, match_id):
+    return f"{ESPN_BASE_URL}/{league}/summary?event={match_id}"
+
+
+def _load_summary_routes():
     try:
-        header = r_data['header']
-        status = header['competitions'][0]['status']['type']['state']
-
-        if status != 'post':
-            return None
-
-        competitors = header['competitions'][0]['competitors']
-        if competitors[0]['id'] == str(TEAM_ID_ESPN):
-            ars, opp = competitors[0], competitors[1]
-        else:
-            ars, opp = competitors[1], competitors[0]
-
-        # Extract match context from gameInfo and header
-        game_info = r_data.get('gameInfo', {})
-        venue_info = game_info.get('venue', {})
-        officials = game_info.get('officials', [])
-        league_info = header.get('league', {})
-
-        data = {
-            "opponent": opp['team']['displayName'],
-            "ars_score": ars['score'], "opp_score": opp['score'],
-            "ars_logo_img": get_image_from_url(ars['team']['logos'][0]['href']),
-            "opp_logo_img": get_image_from_url(opp['team']['logos'][0]['href']),
-            "ars_goals": [], "opp_goals": [],
-            "ars_poss": 0, "ars_shots": 0, "ars_sot": 0,
-            "opp_poss": 0, "opp_shots": 0, "opp_sot": 0,
-            "ars_xg": None, "opp_xg": None,
-            "ars_pass_pct": None, "opp_pass_pct": None,
-            "match_date": header['competitions'][0]['date'],
-            "venue": venue_info.get('fullName', ''),
-            "attendance": game_info.get('attendance'),
-            "referee": officials[0].get('displayName', '') if officials else '',
-            "competition": league_info.get('name', ''),
-        }
-
-        # Parse boxscore statistics
-        boxscore = r_data.get('boxscore', {})
-        for team in boxscore.get('teams', []):
-            prefix = "ars" if team['team']['id'] == str(TEAM_ID_ESPN) else "opp"
-            for s in team.get('statistics', []):
-                try:
-                    val = float(s['displayValue']) if '.' in s['displayValue'] else int(s['displayValue'])
-                except (ValueError, KeyError):
-                    val = 0
-
-                if s['name'] == "possessionPct":   data[f"{prefix}_poss"] = int(val)
-                elif s['name'] == "totalShots":    data[f"{prefix}_shots"] = int(val)
-                elif s['name'] == "shotsOnTarget": data[f"{prefix}_sot"] = int(val)
-                elif s['name'] == "passPct":       data[f"{prefix}_pass_pct"] = int(round(val * 100))
-                elif s['name'] == "expectedGoals": data[f"{prefix}_xg"] = round(val, 2)
-
-        # Parse and aggregate goalscorers
-        timeline = header.get('competitions', [{}])[0].get('details', [])
-        if timeline:
-            ars_goals_dict = {}
-            opp_goals_dict = {}
-
-            for e in timeline:
-                if e.get('scoringPlay', False):
-                    scorer_full = e.get('participants', [{}])[0].get('athlete', {}).get('displayName', 'Unknown')
-                    scorer_last = scorer_full.split()[-1].upper()
-
-                    if e.get('ownGoal', False):
-                        scorer_last += " (OG)"
-
-                    time_str = e.get('clock', {}).get('displayValue', '')
-                    if ":" in time_str:
-                        time_str = time_str.split(":")[0]
-                    if not time_str.endswith("'"):
-                        time_str += "'"
-
-                    team_id = e.get('team', {}).get('id')
-                    target_dict = ars_goals_dict if team_id == str(TEAM_ID_ESPN) else opp_goals_dict
-
-                    if scorer_last in target_dict:
-                        target_dict[scorer_last].append(time_str)
-                    else:
-                        target_dict[scorer_last] = [time_str]
-
-            data['ars_goals'] = [f"{name}   {', '.join(times)}" for name, times in ars_goals_dict.items()]
-            data['opp_goals'] = [f"{name}   {', '.join(times)}" for name, times in opp_goals_dict.items()]
-
-        return data
-    except Exception as e:
-        log.exception("Error parsing stats for match %s", match_id)
+        with open(SUMMARY_ROUTES_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _remember_summary_route(match_id, league):
+    routes = _load_summary_routes()
+    if routes.get(str(match_id)) == league:
+        return
+    routes.pop(str(match_id), None)
+    routes[str(match_id)] = league
+    # Dicts keep insertion order, so the oldest entries are dropped first.
+    routes = dict(list(routes.items())[-SUMMARY_ROUTES_MAX:])
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(SUMMARY_ROUTES_FILE, "w") as f:
+            json.dump(routes, f)
+    except OSError as e:
+        log.warning("Could not save summary route: %s", e)
+
+
+def _fetch_summary(url, timeout):
+    resp = cached_get(url, "summary", headers=get_headers(), timeout=timeout)
+    if resp.status_code == 200:
+        candidate = load_summary(resp.content)
+        if candidate.get('header', {}).get('competitions'):
+            return candidate
+    return None
+
+
+def fetch_match_summary(match_id, hedge_delay=SUMMARY_HEDGE_DELAY, deadline=SUMMARY_DEADLINE):
+    """Return the ESPN summary payload for ``match_id`` (trimmed by ``load_summary``), or None.
+
+    The ``/all/`` endpoint (or the league endpoint that last worked for this
+    match) is requested first.  If it has not produced a valid payload after
+    ``hedge_delay`` seconds, every other league endpoint is raced against it
+    and the first response carrying ``header.competitions`` wins.  Losing
+    requests that have not started are cancelled; ones already in flight are
+    abandoned rather than awaited.
+    """
+    preferred = _load_summary_routes().get(str(match_id), "all")
+    hedges = [league for league in ["all"] + LEAGUES if league != preferred]
+
+    pool = ThreadPoolExecutor(max_workers=1 + len(hedges))
+    futures = {pool.submit(_fetch_summary, _summary_url(preferred, match_id), deadline): preferred}
+    try:
+        done, _ = wait(futures, timeout=hedge_delay)
+        if not any(_result_or_none(fut) is not None for fut in done):
+            metrics.add_retry("summary", len(hedges))
+            for league in hedges:
+                futures[pool.submit(_fetch_summary, _summary_url(league, match_id), deadline)] = league
+
+        for fut in as_completed(list(futures), timeout=deadline):
+            payload = _result_or_none(fut)
+            if payload is not None:
+                league = futures[fut]
+                if league != preferred:
+                    log.info("Summary for %s served by %s endpoint", match_id, league)
+                _remember_summary_route(match_id, league)
+                return payload
+    except TimeoutError:
+        log.warning("Summary deadline (%ss) reached for match %s", deadline, match_id)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return None
+
+
+def _result_or_none(fut):
+    try:
+        return fut.result()
+    except Exception:
+        return None
+
+
+def get_match_stats_espn(match_id, team_id=TEAM_ID_ESPN):
+    """Fetch a given ESPN match ID's summary and parse it into a ``MatchRecord``."""
+    with metrics.stage("summary"):
+        r_data = fetch_match_summary(match_id)
+    if r_data is None:
+        log.error("Could not fetch summary for match %s from any endpoint", match_id)
         return None
+    with metrics.stage("parse"):
+        return parse_match_summary(r_data, match_id, team_id)
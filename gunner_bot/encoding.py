@@ -0,0 +1,113 @@
+"""Card encoding for upload.
+
+Each encoder turns the rendered PIL image into bytes in memory; nothing is
+written to disk.  Run ``python -m gunner_bot.encoding card.png`` to compare
+encode time and size for every option on a rendered card.
+"""
+import argparse
+import io
+import logging
+import time
+
+from PIL import Image
+
+from .config import IMAGE_FORMAT
+
+log = logging.getLogger(__name__)
+
+# Bluesky rejects image blobs larger than this.
+BLOB_LIMIT = 1_000_000
+
+
+def _png(img, compress_level):
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=compress_level)
+    return buf.getvalue()
+
+
+def _png_palette(img):
+    # The card is mostly flat colour, so 256 colours are nearly lossless.
+    quantized = img.convert("RGB").quantize(colors=256, method=2, dither=0)
+    buf = io.BytesIO()
+    quantized.save(buf, format="PNG", compress_level=9)
+    return buf.getvalue()
+
+
+def _jpeg(img, quality):
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, format="JPEG", quality=quality, subsampling=0, optimize=True)
+    return buf.getvalue()
+
+
+def _webp(img, quality):
+    buf = io.BytesIO()
+    img.save(buf, format="WEBP", quality=quality, method=4)
+    return buf.getvalue()
+
+
+# name -> (encode function, MIME type)
+ENCODERS = {
+    "png": (lambda img: _png(img, 6), "image/png"),
+    "png-fast": (lambda img: _png(img, 1), "image/png"),
+    "png-palette": (_png_palette, "image/png"),
+    "jpeg": (lambda img: _jpeg(img, 92), "image/jpeg"),
+    "webp": (lambda img: _webp(img, 90), "image/webp"),
+}
+
+# Tried in order when the selected encoder overshoots BLOB_LIMIT.
+FALLBACKS = ["png-palette", "jpeg", "webp"]
+
+
+def encode_image(img, fmt=IMAGE_FORMAT):
+    """Encode ``img`` with encoder ``fmt`` and return ``(bytes, mime_type)``.
+
+    If the result is over Bluesky's blob limit the FALLBACKS are tried in
+    turn, then JPEG at decreasing quality.
+    """
+    candidates = [fmt] + [f for f in FALLBACKS if f != fmt]
+    for name in candidates:
+        encode, mime = ENCODERS[name]
+        start = time.perf_counter()
+        data = encode(img)
+        log.info("Encoded card as %s: %d bytes in %.1f ms", name, len(data), (time.perf_counter() - start) * 1000)
+        if len(data) <= BLOB_LIMIT:
+            return data, mime
+        log.warning("%s output exceeds the %d byte blob limit", name, BLOB_LIMIT)
+
+    for quality in (85, 75, 60):
+        data = _jpeg(img, quality)
+        if len(data) <= BLOB_LIMIT:
+            return data, "image/jpeg"
+    raise ValueError("Could not encode card under the Bluesky blob limit")
+
+
+def compare(img, repeat=5):
+    """Return ``[(name, best_ms, size_bytes)]`` for every encoder."""
+    results = []
+    for name, (encode, _mime) in ENCODERS.items():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = encode(img)
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        results.append((name, best, len(data)))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gunner_bot.encoding",
+                                     description="Compare card encoders by time and size.")
+    parser.add_argument("image", help="A rendered card (any format Pillow can read)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with Image.open(args.image) as im:
+        img = im.convert("RGB")
+    print(f"{'encoder':<13}{'ms':>9}{'bytes':>10}  under limit")
+    for name, ms, size in compare(img, args.repeat):
+        print(f"{name:<13}{ms:>9.1f}{size:>10}  {'yes' if size <= BLOB_LIMIT else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Local index of every fixture in the configured leagues.
+
+One SQLite row per ESPN event with its league, kick-off, state and
+opponent, kept up to date from league schedule responses (see
+``data.refresh_fixture_index``).  "Most recent result", "next kick-off"
+and "fixtures on a date" are then indexed lookups, and a league only has
+to be re-read when ``leagues_due`` says something in it may have changed.
+
+Kick-off times are stored as ESPN sends them (``2025-01-24T15:00Z``), which
+sort and compare correctly as strings.
+"""
+import datetime
+import logging
+import os
+import sqlite3
+
+from .config import FIXTURES_FILE, FIXTURES_MAX_AGE, LEAGUES, TEAM_ID_ESPN
+from .polling import CANCELLED_STATUSES
+
+log = logging.getLogger(__name__)
+
+# A fixture that kicked off longer ago than this without a result is left
+# to the periodic full read.
+RESULT_WINDOW = datetime.timedelta(days=1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fixtures (
+    match_id TEXT PRIMARY KEY,
+    league   TEXT NOT NULL,
+    date     TEXT NOT NULL,
+    state    TEXT NOT NULL,
+    status   TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    name     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fixtures_state_date ON fixtures (state, date);
+CREATE INDEX IF NOT EXISTS fixtures_date ON fixtures (date);
+CREATE TABLE IF NOT EXISTS leagues (
+    league       TEXT PRIMARY KEY,
+    refreshed_at TEXT NOT NULL
+);
+"""
+
+_COLUMNS = "match_id, league, date, state, status, opponent, name"
+
+
+def _espn_time(dt):
+    return dt.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%MZ")
+
+
+def _marks(items):
+    return ",".join("?" * len(items))
+
+
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _query(path, sql, params=()):
+    """Run a read-only query; returns ``[]`` if the index does not exist yet."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with sqlite3.connect(path) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]
+    except sqlite3.Error as e:
+        log.warning("Could not read fixture index: %s", e)
+        return []
+
+
+def _row(event, league):
+    competition = event['competitions'][0]
+    status = competition['status']['type']
+    team = str(TEAM_ID_ESPN)
+    opponent = next((c.get('team', {}).get('displayName', '') for c in competition['competitors']
+                     if c['id'] != team), '')
+    return (event['id'], league, event['date'], status['state'], status.get('name', ''), opponent,
+            event.get('name', ''))
+
+
+def leagues_due(leagues=LEAGUES, now=None, path=FIXTURES_FILE):
+    """Return ``{league: full}`` for the leagues whose schedules should be re-read.
+
+    ``full`` is True when the league has never been read or its last full
+    read is older than ``FIXTURES_MAX_AGE``; otherwise the league is only
+    listed if one of its fixtures kicked off within ``RESULT_WINDOW`` and
+    has no result yet.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    marks = _marks(leagues)
+    refreshed = {r["league"]: r["refreshed_at"] for r in _query(
+        path, f"SELECT league, refreshed_at FROM leagues WHERE league IN ({marks})", leagues)}
+    live = {r["league"] for r in _query(
+        path,
+        f"SELECT DISTINCT league FROM fixtures WHERE date BETWEEN ? AND ? AND state != 'post' "
+        f"AND league IN ({marks})",
+        (_espn_time(now - RESULT_WINDOW), _espn_time(now), *leagues))}
+
+    cutoff = (now - datetime.timedelta(seconds=FIXTURES_MAX_AGE)).isoformat()
+    due = {}
+    for league in leagues:
+        if refreshed.get(league, "") < cutoff:
+            due[league] = True
+        elif league in live:
+            due[league] = False
+    return due
+
+
+def update(league, events, full=False, now=None, path=FIXTURES_FILE):
+    """Upsert ``events`` from one league schedule; return how many were stored.
+
+    A ``full`` read also records the league as refreshed at ``now``.
+    """
+    rows = {}
+    for e in events:
+        try:
+            row = _row(e, league)
+        except (KeyError, IndexError, TypeError):
+            log.warning("Malformed %s schedule event", league)
+            continue
+        rows[row[0]] = row
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    try:
+        conn = _connect(path)
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO fixtures ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows.values())
+            if full:
+                conn.execute("INSERT OR REPLACE INTO leagues (league, refreshed_at) VALUES (?, ?)",
+                             (league, now.isoformat()))
+        conn.close()
+    except sqlite3.Error as e:
+        log.warning("Could not update fixture index for %s: %s", league, e)
+        return 0
+    return len(rows)
+
+
+def last_completed(leagues=LEAGUES, path=FIXTURES_FILE):
+    """Return the most recent fixture with a result, or None.
+
+    Postponed, cancelled, abandoned and forfeited fixtures are skipped.
+    """
+    skip = sorted(CANCELLED_STATUSES)
+    rows = _query(
+        path,
+        f"SELECT {_COLUMNS} FROM fixtures WHERE state = 'post' "
+        f"AND status NOT IN ({_marks(skip)}) AND league IN ({_marks(leagues)}) "
+        f"ORDER BY date DESC LIMIT 1",
+        (*skip, *leagues))
+    return rows[0] if rows else None
+
+
+def next_kickoff(now=None, leagues=LEAGUES, path=FIXTURES_FILE):
+    """Return the first fixture kicking off at or after ``now``, or None."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    rows = _query(
+        path,
+        f"SELECT {_COLUMNS} FROM fixtures WHERE date >= ? AND state = 'pre' "
+        f"AND league IN ({_marks(leagues)}) ORDER BY date LIMIT 1",
+        (_espn_time(now), *leagues))
+    return rows[0] if rows else None
+
+
+def on_date(day, leagues=LEAGUES, path=FIXTURES_FILE):
+    """Return the fixtures kicking off on ``day`` (a UTC ``datetime.date``), by kick-off."""
+    return _query(
+        path,
+        f"SELECT {_COLUMNS} FROM fixtures WHERE date >= ? AND date < ? "
+        f"AND league IN ({_marks(leagues)}) ORDER BY date",
+        (f"{day:%Y-%m-%d}", f"{day + datetime.timedelta(days=1):%Y-%m-%d}", *leagues))
@@ -0,0 +1,77 @@
+"""Font registry for the renderer.
+
+The font file is resolved once per process and ``FreeTypeFont`` objects are
+memoized by size, so repeated ``get_font`` calls cost a dict lookup.  Nothing
+here touches the network on the render path; to place Roboto in FONT_DIR
+ahead of time run::
+
+    python -m gunner_bot.fonts
+"""
+import functools
+import logging
+import os
+
+from .client import request
+from .config import FONT_DIR
+
+log = logging.getLogger(__name__)
+
+FONT_URL = "https://github.com/google/fonts/raw/main/apache/roboto/static/Roboto-Bold.ttf"
+FONT_FILES = ["Roboto-Bold.ttf", "font.ttf"]
+
+SYSTEM_FONTS = [
+    "font.ttf",
+    "C:/Windows/Fonts/arialbd.ttf",
+    "C:/Windows/Fonts/seguiemj.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_font_path():
+    """Return the first available font file, or None to use Pillow's default."""
+    candidates = [os.path.join(FONT_DIR, name) for name in FONT_FILES] + SYSTEM_FONTS
+    for p in candidates:
+        if os.path.exists(p):
+            log.debug("Using font %s", p)
+            return p
+    log.warning("No font file found (run `python -m gunner_bot.fonts`); using Pillow default")
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(size):
+    from PIL import ImageFont
+
+    path = resolve_font_path()
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+@functools.lru_cache(maxsize=2048)
+def text_bbox(text, font):
+    """Memoized equivalent of ``ImageDraw.textbbox((0, 0), text, font=font)``."""
+    return font.getbbox(text, mode="L")
+
+
+def download_font(dest_dir=FONT_DIR):
+    """Fetch Roboto Bold into ``dest_dir`` unless it is already there."""
+    dest = os.path.join(dest_dir, FONT_FILES[0])
+    if os.path.exists(dest):
+        log.info("Font already present: %s", dest)
+        return dest
+    r = request("GET", FONT_URL)
+    r.raise_for_status()
+    os.makedirs(dest_dir, exist_ok=True)
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(r.content)
+    os.replace(tmp, dest)
+    log.info("Downloaded font to %s", dest)
+    return dest
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    download_font()
@@ -0,0 +1,66 @@
+"""Local record of results that have already been posted.
+
+One SQLite row per ESPN match ID, so the duplicate check is a primary-key
+lookup that needs no network.  Each Bluesky account has its own ledger
+file, so two configured clubs can both post the same match.  The Bluesky
+feed is only consulted when the ledger file does not exist yet (see
+``runner.run_once``).
+"""
+import datetime
+import logging
+import os
+import sqlite3
+
+from .config import LEDGER_FILE
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posted (
+    match_id   TEXT PRIMARY KEY,
+    opponent   TEXT NOT NULL,
+    match_date TEXT NOT NULL,
+    posted_at  TEXT NOT NULL,
+    uri        TEXT
+)
+"""
+
+
+def exists(path=LEDGER_FILE):
+    return os.path.exists(path)
+
+
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def is_posted(match_id, path=LEDGER_FILE):
+    """True if ``match_id`` is in the ledger.  Never creates the file."""
+    if not exists(path):
+        return False
+    try:
+        with sqlite3.connect(path) as conn:
+            row = conn.execute("SELECT 1 FROM posted WHERE match_id = ?", (str(match_id),)).fetchone()
+        return row is not None
+    except sqlite3.Error as e:
+        log.warning("Could not read posted ledger: %s", e)
+        return False
+
+
+def record(match_id, opponent, match_date, uri=None, path=LEDGER_FILE):
+    """Mark ``match_id`` as posted (idempotent)."""
+    posted_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    try:
+        conn = _connect(path)
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO posted (match_id, opponent, match_date, posted_at, uri) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(match_id), opponent, match_date, posted_at, uri),
+            )
+        conn.close()
+    except sqlite3.Error as e:
+        log.warning("Could not record match %s in posted ledger: %s", match_id, e)
@@ -0,0 +1,110 @@
+"""Per-run stage timing.
+
+Pipeline code wraps each stage in ``with metrics.stage("name"):`` and
+reports payload sizes and retries against it.  At the end of a run
+``write_summary`` logs one JSON object and, if METRICS_FILE is set, appends
+it as a line to that file.
+
+Stages used: ``schedule``, ``scoreboard``, ``summary``, ``parse``, ``logo``,
+``render``, ``encode``, ``bsky_session``, ``bsky_feed``, ``bsky_upload``,
+``bsky_post`` and (multi-club runs, one per card) ``publish``.  Stages may nest (crest downloads happen while parsing), so
+their wall times are not additive.
+"""
+import contextlib
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+from .config import METRICS_FILE
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_stages = {}
+_values = {}
+_started = time.time()
+
+
+def _entry(name):
+    return _stages.setdefault(name, {"calls": 0, "wall_ms": 0.0, "bytes": 0, "retries": 0})
+
+
+@contextlib.contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        with _lock:
+            entry = _entry(name)
+            entry["calls"] += 1
+            entry["wall_ms"] += elapsed
+
+
+def add_bytes(name, n):
+    with _lock:
+        _entry(name)["bytes"] += n
+
+
+def add_retry(name, n=1):
+    with _lock:
+        _entry(name)["retries"] += n
+
+
+def take_stages():
+    """Return the stage entries recorded so far and start afresh (for worker processes)."""
+    global _stages
+    with _lock:
+        stages, _stages = _stages, {}
+    return stages
+
+
+def add_stages(stages):
+    """Add stage entries from ``take_stages`` in another process to this run."""
+    with _lock:
+        for name, e in stages.items():
+            entry = _entry(name)
+            for key in entry:
+                entry[key] += e.get(key, 0)
+
+
+def set_value(key, value):
+    """Attach a run-level value (match ID, timestamps, exit code, ...)."""
+    with _lock:
+        _values[key] = value
+
+
+def get_value(key, default=None):
+    with _lock:
+        return _values.get(key, default)
+
+
+def summary():
+    with _lock:
+        stages = {name: dict(e, wall_ms=round(e["wall_ms"], 1)) for name, e in _stages.items()}
+        values = dict(_values)
+    return {
+        "started_at": datetime.datetime.fromtimestamp(_started, datetime.timezone.utc).isoformat(),
+        "duration_s": round(time.time() - _started, 3),
+        "stages": stages,
+        **values,
+    }
+
+
+def write_summary(path=METRICS_FILE):
+    """Log the run summary as JSON and append it to ``path`` when set."""
+    record = summary()
+    line = json.dumps(record, sort_keys=True)
+    log.info("Run metrics: %s", line)
+    if path:
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            log.warning("Could not append metrics to %s: %s", path, e)
+    return record
@@ -0,0 +1,104 @@
+"""Live-status driven poll scheduling.
+
+ESPN scoreboards report each fixture's ``state`` (pre / in / post), status
+``name`` (STATUS_FIRST_HALF, STATUS_HALFTIME, ...), ``period`` and match
+``clock`` in seconds.  From those we predict when the final whistle will go
+and space polls so they get denser as it approaches, back off through half
+time and delays, and fire immediately once the state flips to ``post``.
+"""
+import datetime
+
+HALF = 45 * 60
+HALF_TIME_BREAK = 15 * 60
+EXTRA_HALF = 15 * 60
+EXTRA_TIME_BREAK = 5 * 60
+SHOOTOUT = 15 * 60
+# Typical stoppage time added to each half / extra-time half.
+STOPPAGE_FIRST = 2 * 60
+STOPPAGE_SECOND = 6 * 60
+STOPPAGE_EXTRA = 2 * 60
+
+# Poll spacing (seconds).
+NEAR_INTERVAL = 20       # within APPROACH of the predicted whistle, or past it
+APPROACH = 4 * 60
+MIN_INTERVAL = 30
+MAX_INTERVAL = 15 * 60   # re-read the status at least this often
+DELAYED_INTERVAL = 10 * 60
+ERROR_RETRY = 15         # after a failed attempt; doubles per consecutive failure
+
+DELAY_STATUSES = {"STATUS_DELAYED", "STATUS_RAIN_DELAY", "STATUS_SUSPENDED"}
+# ESPN moves these to state "post" even though no result will come.
+CANCELLED_STATUSES = {"STATUS_POSTPONED", "STATUS_CANCELED", "STATUS_ABANDONED", "STATUS_FORFEIT"}
+
+
+def _parse_date(s):
+    return datetime.datetime.fromisoformat(s.replace('Z', '+00:00'))
+
+
+def predict_final_whistle(status, now):
+    """Return the predicted time of the final whistle as an aware datetime.
+
+    ``status`` is a ``data.get_live_status`` dict.  Returns ``now`` once the
+    match is over and None when no prediction makes sense (delayed or
+    suspended matches).
+    """
+    state, name = status["state"], status.get("name", "")
+    clock = float(status.get("clock") or 0)
+    period = int(status.get("period") or 0)
+
+    if state == "post":
+        return now
+    if name in DELAY_STATUSES:
+        return None
+    if state == "pre":
+        kickoff = max(_parse_date(status["date"]), now)
+        remaining = 2 * HALF + STOPPAGE_FIRST + HALF_TIME_BREAK + STOPPAGE_SECOND
+        return kickoff + datetime.timedelta(seconds=remaining)
+
+    if name == "STATUS_HALFTIME":
+        remaining = HALF_TIME_BREAK + HALF + STOPPAGE_SECOND
+    elif period <= 1:
+        remaining = max(HALF + STOPPAGE_FIRST - clock, 0) + HALF_TIME_BREAK + HALF + STOPPAGE_SECOND
+    elif period == 2:
+        remaining = max(2 * HALF + STOPPAGE_SECOND - clock, 0)
+    elif period in (3, 4):
+        # Extra time: clock keeps counting from 90'.
+        remaining = max(2 * HALF + 2 * EXTRA_HALF + STOPPAGE_EXTRA - clock, 0)
+        if period == 3:
+            remaining += EXTRA_TIME_BREAK
+    else:
+        remaining = SHOOTOUT
+    return now + datetime.timedelta(seconds=remaining)
+
+
+def next_poll_delay(status, now, fallback):
+    """Seconds to wait before reading the live status again.
+
+    ``fallback`` is used when the fixture is not on any scoreboard.
+    """
+    if status is None:
+        return fallback
+    if status["state"] == "post":
+        return 0
+    if status.get("name") in DELAY_STATUSES:
+        return DELAYED_INTERVAL
+
+    whistle = predict_final_whistle(status, now)
+    remaining = (whistle - now).total_seconds()
+    if remaining <= APPROACH:
+        return NEAR_INTERVAL
+    # Sleep until just before the approach window, re-checking the status at
+    # least every MAX_INTERVAL so stoppage time and delays are picked up.  The
+    # whistle estimate already counts the half-time break, so half time gets
+    # the longest waits of the match.
+    return int(min(max(remaining - APPROACH, MIN_INTERVAL), MAX_INTERVAL))
+
+
+def error_retry_delay(failures, fallback):
+    """Seconds to wait after ``failures`` consecutive failed attempts.
+
+    The first retry comes quickly (the usual cause is a summary lagging the
+    scoreboard); after that the wait doubles up to ``fallback`` so a failure
+    that will not clear on its own is not retried every few seconds.
+    """
+    return min(ERROR_RETRY * 2 ** (failures - 1), fallback)
@@ -0,0 +1,83 @@
+"""Pre-kickoff warm-up: ``python -m gunner_bot.prefetch``.
+
+Everything on the card that does not depend on the result can be prepared
+before the final whistle: the match ID, both crests and their rendered
+variants, the fonts and the static templates for every stat-row count.
+``prefetch`` does that by rendering throwaway cards for the fixture, so
+once the state flips to ``post`` only the score, goalscorers and stat bars
+are left to draw.  The crests and templates also land in the on-disk
+stores, so the poller workflow runs this before it sleeps and the resident
+poller starts warm.
+
+If the fixture is postponed or cancelled, ``discard`` drops the speculative
+state.
+"""
+import logging
+
+from . import badges, metrics
+from .config import LEAGUES, TEAM_ID_ESPN
+from .data import get_live_status
+from .polling import CANCELLED_STATUSES
+from .summary import MatchRecord
+
+log = logging.getLogger(__name__)
+
+# (xG, pass accuracy) present or not covers every stat-row count the card
+# can have.
+_ROW_VARIANTS = [(None, None), (0.0, None), (0.0, 0)]
+
+
+def prefetch(leagues=LEAGUES, status=None):
+    """Warm everything for today's fixture and return its status dict.
+
+    Returns None when there is no fixture on the scoreboards or it has been
+    postponed or cancelled.
+    """
+    if status is None:
+        status = get_live_status(leagues)
+    if status is None:
+        log.info("Prefetch: no fixture on today's scoreboards")
+        return None
+    if status.get("name") in CANCELLED_STATUSES:
+        log.info("Prefetch: match %s is %s; nothing to prepare", status["id"], status["detail"])
+        return None
+
+    from .rendering import create_match_image
+
+    with metrics.stage("prefetch"):
+        team = str(TEAM_ID_ESPN)
+        crests = {
+            team_id: badges.fetch_crest(team_id, href)
+            for team_id, href in status.get("crests", {}).items()
+        }
+        ars_badge = crests.pop(team, None)
+        opp_badge = next(iter(crests.values()), None)
+
+        for xg, pass_pct in _ROW_VARIANTS:
+            create_match_image(MatchRecord(
+                opponent="", ars_score="0", opp_score="0",
+                ars_badge=ars_badge, opp_badge=opp_badge,
+                ars_xg=xg, opp_xg=xg, ars_pass_pct=pass_pct, opp_pass_pct=pass_pct,
+            ))
+    log.info("Prefetch: match %s (%s) ready, crests %s", status["id"], status["league"],
+             "stored" if ars_badge and opp_badge else "incomplete")
+    return status
+
+
+def discard():
+    """Throw away the speculative state kept in memory for a fixture."""
+    badges.forget_variants()
+    log.info("Prefetch: speculative state discarded")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    try:
+        prefetch()
+    except Exception:
+        # Best effort: the poller still works cold.
+        log.exception("Prefetch failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,208 @@
+import base64
 import datetime
+import json
 import logging
-import requests
+import os
+import time
 
-from .config import BSKY_HANDLE, BSKY_PASSWORD
+from . import metrics
+from .client import request
+from .config import BSKY_BASE_URL, BSKY_HANDLE, BSKY_PASSWORD, BSKY_SESSION_FILE
 
 log = logging.getLogger(__name__)
 
+# Treat an access token this close to expiry as already expired.
+TOKEN_EXPIRY_MARGIN = 120
 
-def get_bluesky_session():
-    if not BSKY_HANDLE or not BSKY_PASSWORD:
+_session_stats = {"reused": 0, "refreshed": 0, "login": 0}
+
+
+def _jwt_expiry(token):
+    """Return the ``exp`` claim of a JWT (seconds since the epoch), or 0."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0)
+    except (IndexError, ValueError, AttributeError):
+        return 0
+
+
+def _load_stored_session(handle, path):
+    try:
+        with open(path) as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if session.get("handle") != handle and session.get("identifier") != handle:
         return None
+    return session
+
+
+def _store_session(session, handle, path):
+    """Persist the session tokens, readable by the current user only."""
+    stored = dict(session, identifier=handle)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(stored, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("Could not store Bluesky session: %s", e)
+
+
+def _refresh_session(refresh_jwt):
+    resp = request(
+        "POST", f"{BSKY_BASE_URL}/xrpc/com.atproto.server.refreshSession",
+        headers={"Authorization": f"Bearer {refresh_jwt}"}, idempotent=True,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _create_session(handle, password):
+    # Repeating a login only opens another session, so a 5xx is retried
+    # rather than leaving a whole polling window in dry-run mode.
+    resp = request(
+        "POST", f"{BSKY_BASE_URL}/xrpc/com.atproto.server.createSession",
+        json={"identifier": handle, "password": password}, idempotent=True,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def get_bluesky_session(handle=BSKY_HANDLE, password=BSKY_PASSWORD, session_file=BSKY_SESSION_FILE):
+    """Return a usable Bluesky session, logging in only when unavoidable.
+
+    A session stored in ``session_file`` is reused while its access token is
+    valid (no round trip) and renewed with ``refreshSession`` once it has
+    expired.  ``createSession`` with the password is the last resort, used
+    when there is no stored session or the refresh token has been rejected.
+    The defaults are the single account from the environment; see
+    ``teams`` for one session per configured account.
+    """
+    if not handle or not password:
+        return None
+
+    stored = _load_stored_session(handle, session_file)
+    if stored:
+        if _jwt_expiry(stored.get("accessJwt")) - TOKEN_EXPIRY_MARGIN > time.time():
+            _session_stats["reused"] += 1
+            return stored
+        try:
+            with metrics.stage("bsky_session"):
+                session = _refresh_session(stored["refreshJwt"])
+            _store_session(session, handle, session_file)
+            _session_stats["refreshed"] += 1
+            return session
+        except Exception as e:
+            log.info("Stored Bluesky session could not be refreshed (%s); logging in", e)
+
     try:
-        resp = requests.post(
-            "https://bsky.social/xrpc/com.atproto.server.createSession",
-            json={"identifier": BSKY_HANDLE, "password": BSKY_PASSWORD}
-        )
-        resp.raise_for_status()
-        return resp.json()
+        with metrics.stage("bsky_session"):
+            session = _create_session(handle, password)
+        _store_session(session, handle, session_file)
+        _session_stats["login"] += 1
+        return session
     except Exception as e:
         log.error("Session Error: %s", e)
         return None
 
 
-def check_if_already_posted(session, opponent_name):
-    log.info("Checking history for: %s", opponent_name)
+def log_session_stats():
+    s = _session_stats
+    if not any(s.values()):
+        return
+    # Every reuse skips a round trip; a refresh still costs one but avoids a
+    # password login counting towards Bluesky's login rate limit.
+    log.info("Bluesky session: %d reused, %d refreshed, %d password logins (%d round trips saved)",
+             s["reused"], s["refreshed"], s["login"], s["reused"])
+
+
+# Safety cap on how far back the history check pages through the feed.
+FEED_PAGE_SIZE = 50
+FEED_MAX_PAGES = 20
+
+
+def _parse_timestamp(ts):
+    return datetime.datetime.fromisoformat(ts.replace('Z', '+00:00'))
+
+
+def find_existing_post(session, opponent_name, since):
+    """Return the URI of a "Full Time" post about ``opponent_name`` made after ``since``.
+
+    Pages backwards through the author feed with its cursor until posts are
+    older than ``since`` (an aware datetime, normally kick-off), so earlier
+    meetings with the same opponent are not mistaken for this one.  Reposts
+    are skipped.  Returns None when there is no such post or the feed
+    cannot be read.
+    """
+    log.info("Checking history for: %s since %s", opponent_name, since)
     if not session:
-        return False
+        return None
     try:
-        params = {"actor": session["did"], "limit": 10}
         headers = {"Authorization": f"Bearer {session['accessJwt']}"}
-        resp = requests.get(
-            "https://bsky.social/xrpc/app.bsky.feed.getAuthorFeed",
-            headers=headers, params=params
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-        for item in data.get("feed", []):
-            text = item.get("post", {}).get("record", {}).get("text", "")
-            if opponent_name.lower() in text.lower() and "Full Time" in text:
-                log.info("Found existing post: %s", text)
-                return True
-        return False
+        params = {"actor": session["did"], "limit": FEED_PAGE_SIZE, "filter": "posts_no_replies"}
+        for _ in range(FEED_MAX_PAGES):
+            with metrics.stage("bsky_feed"):
+                resp = request(
+                    "GET", f"{BSKY_BASE_URL}/xrpc/app.bsky.feed.getAuthorFeed",
+                    headers=headers, params=params, stage="bsky_feed"
+                )
+            metrics.add_bytes("bsky_feed", len(resp.content))
+            resp.raise_for_status()
+            data = resp.json()
+
+            for item in data.get("feed", []):
+                if item.get("reason"):
+                    # A repost sits at the time it was reposted but carries the
+                    # original post's createdAt, which would end the scan early.
+                    continue
+                post = item.get("post", {})
+                record = post.get("record", {})
+                created = _parse_timestamp(record.get("createdAt", "1970-01-01T00:00:00Z"))
+                if created < since:
+                    return None
+                text = record.get("text", "")
+                if opponent_name.lower() in text.lower() and "Full Time" in text:
+                    log.info("Found existing post: %s", text)
+                    return post.get("uri", "")
+
+            if not data.get("cursor") or not data.get("feed"):
+                return None
+            params["cursor"] = data["cursor"]
+        log.warning("History check stopped after %d pages", FEED_MAX_PAGES)
+        return None
     except Exception as e:
         log.error("History Check Error: %s", e)
-        return False
+        return None
+
 
+def post_to_bluesky(session, image_data, caption, mime_type="image/png"):
+    """Upload the encoded image and publish the post; return the post URI once it is live.
 
-def post_to_bluesky(session, image_path, caption):
+    ``image_data`` is the encoded card (see ``encoding.encode_image``) and is
+    uploaded straight from memory.
+    """
     log.info("Connecting to Bluesky...")
     if not session:
         log.warning("Secrets not configured. Skipping post.")
-        return
+        return None
 
     try:
         access_jwt = session["accessJwt"]
         did = session["did"]
 
-        log.info("Uploading image...")
-        with open(image_path, "rb") as f:
-            img_data = f.read()
-
-        blob_resp = requests.post(
-            "https://bsky.social/xrpc/com.atproto.repo.uploadBlob",
-            headers={"Authorization": f"Bearer {access_jwt}", "Content-Type": "image/png"},
-            data=img_data
-        )
+        log.info("Uploading image (%d bytes, %s)...", len(image_data), mime_type)
+        with metrics.stage("bsky_upload"):
+            # Blobs are content-addressed, so a repeated upload is harmless.
+            blob_resp = request(
+                "POST", f"{BSKY_BASE_URL}/xrpc/com.atproto.repo.uploadBlob",
+                headers={"Authorization": f"Bearer {access_jwt}", "Content-Type": mime_type},
+                data=image_data, idempotent=True, stage="bsky_upload"
+            )
+        metrics.add_bytes("bsky_upload", len(image_data))
         blob_resp.raise_for_status()
         blob = blob_resp.json()["blob"]
 
@@ -83,11 +220,15 @@ def post_to_bluesky(session, image_path, caption):
                 }
             }
         }
-        requests.post(
-            "https://bsky.social/xrpc/com.atproto.repo.createRecord",
-            headers={"Authorization": f"Bearer {access_jwt}"},
-            json=post_data
-        ).raise_for_status()
+        with metrics.stage("bsky_post"):
+            record_resp = request(
+                "POST", f"{BSKY_BASE_URL}/xrpc/com.atproto.repo.createRecord",
+                headers={"Authorization": f"Bearer {access_jwt}"},
+                json=post_data, stage="bsky_post"
+            )
+        record_resp.raise_for_status()
         log.info("SUCCESS! Posted to Bluesky.")
+        return record_resp.json().get("uri", "")
     except Exception as e:
         log.error("Bluesky Error: %s", e)
+        return None
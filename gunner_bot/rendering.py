@@ -1,35 +1,17 @@
+import hashlib
+import json
 import logging
 import os
-import requests
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from .config import THEME
-
-log = logging.getLogger(__name__)
+from PIL import Image, ImageDraw, ImageFilter
 
+from . import badges
+from .config import CACHE_DIR, THEME
+from .fonts import get_font, text_bbox
 
-# --- Font Loading ---
-
-def get_font(size):
-    paths = [
-        "font.ttf",
-        "C:/Windows/Fonts/arialbd.ttf",
-        "C:/Windows/Fonts/seguiemj.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-    ]
-    for p in paths:
-        if os.path.exists(p):
-            return ImageFont.truetype(p, size)
-    try:
-        url = "https://github.com/google/fonts/raw/main/apache/roboto/static/Roboto-Bold.ttf"
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            with open("font.ttf", "wb") as f:
-                f.write(r.content)
-            return ImageFont.truetype("font.ttf", size)
-    except Exception:
-        pass
-    return ImageFont.load_default()
+log = logging.getLogger(__name__)
 
 
 # --- Drawing Primitives ---
@@ -49,32 +31,57 @@ def add_white_outline(img, thickness=5):
     return result
 
 
+def _shadow_margin(blur):
+    # GaussianBlur is three box-blur passes of roughly ``blur`` pixels each, so
+    # nothing spreads further than ``3 * blur`` from the shape.
+    return int(blur * 3) + 2
+
+
 def draw_shadow_rect(img, x1, y1, x2, y2, radius, blur=20, offset_x=5, offset_y=7, opacity=130):
-    """Draw a soft drop shadow behind a rounded rectangle."""
-    shadow_layer = Image.new('RGBA', img.size, (0, 0, 0, 0))
-    sd = ImageDraw.Draw(shadow_layer)
-    sd.rounded_rectangle(
-        [x1 + offset_x, y1 + offset_y, x2 + offset_x, y2 + offset_y],
-        radius=radius, fill=(0, 0, 0, opacity)
+    """Draw a soft drop shadow behind a rounded rectangle.
+
+    Only the shadow's bounding box plus the blur margin is rasterised and
+    blurred, as a single alpha mask; the result is pixel-identical to
+    blurring a full-canvas layer.
+    """
+    margin = _shadow_margin(blur)
+    sx1, sy1 = x1 + offset_x, y1 + offset_y
+    sx2, sy2 = x2 + offset_x, y2 + offset_y
+    left = max(int(sx1) - margin, 0)
+    top = max(int(sy1) - margin, 0)
+    right = min(int(sx2) + margin + 1, img.width)
+    bottom = min(int(sy2) + margin + 1, img.height)
+    if right <= left or bottom <= top:
+        return
+
+    mask = Image.new('L', (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).rounded_rectangle(
+        [sx1 - left, sy1 - top, sx2 - left, sy2 - top],
+        radius=radius, fill=opacity
     )
-    shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(radius=blur))
-    img.paste(shadow_layer.convert('RGB'), (0, 0), shadow_layer.split()[3])
+    mask = mask.filter(ImageFilter.GaussianBlur(radius=blur))
+    img.paste((0, 0, 0), (left, top, right, bottom), mask)
+
+
+def _hex_to_rgb(h):
+    return tuple(int(h.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
 
 
 def draw_gradient_pill(img, x, y, width, height, color_left, color_right):
-    """Draw a horizontal gradient-filled pill shape."""
-    def hex_to_rgb(h):
-        return tuple(int(h.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+    """Draw a horizontal gradient-filled pill shape.
 
-    lr, lg, lb = hex_to_rgb(color_left)
-    rr, rg, rb = hex_to_rgb(color_right)
+    The colour ramp is computed once as a single pixel row and stretched
+    vertically, instead of drawing one line per column.
+    """
+    lr, lg, lb = _hex_to_rgb(color_left)
+    rr, rg, rb = _hex_to_rgb(color_right)
 
-    grad = Image.new('RGB', (width, height))
-    grad_d = ImageDraw.Draw(grad)
+    span = max(width - 1, 1)
+    row = bytearray()
     for col in range(width):
-        t = col / max(width - 1, 1)
-        grad_d.line([(col, 0), (col, height - 1)],
-                    fill=(int(lr + t*(rr-lr)), int(lg + t*(rg-lg)), int(lb + t*(rb-lb))))
+        t = col / span
+        row += bytes((int(lr + t*(rr-lr)), int(lg + t*(rg-lg)), int(lb + t*(rb-lb))))
+    grad = Image.frombytes('RGB', (width, 1), bytes(row)).resize((width, height), Image.Resampling.NEAREST)
 
     mask = Image.new('L', (width, height), 0)
     ImageDraw.Draw(mask).rounded_rectangle([0, 0, width - 1, height - 1],
@@ -82,111 +89,181 @@ def draw_gradient_pill(img, x, y, width, height, color_left, color_right):
     img.paste(grad, (x, y), mask)
 
 
-def paste_logo_centered(bg_img, logo_img, center_x, center_y, target_height):
-    if not logo_img:
-        return
+def build_logo_variant(logo_img, target_height, thickness):
+    """Resize a crest to ``target_height`` and give it a white outline."""
     aspect = logo_img.width / logo_img.height
     new_w = int(target_height * aspect)
     logo_resized = logo_img.resize((new_w, target_height), Image.Resampling.LANCZOS)
-    logo_outlined = add_white_outline(logo_resized, thickness=4)
+    return add_white_outline(logo_resized, thickness=thickness)
+
+
+def paste_logo_centered(bg_img, badge, center_x, center_y, target_height, thickness=4):
+    """Paste the stored crest ``badge`` (a badge-store hash) centred on a point."""
+    if not badge:
+        return
+    logo_outlined = badges.get_variant(badge, target_height, thickness, build_logo_variant)
+    if logo_outlined is None:
+        return
     paste_x = int(center_x - (logo_outlined.width / 2))
     paste_y = int(center_y - (logo_outlined.height / 2))
     bg_img.paste(logo_outlined, (paste_x, paste_y), logo_outlined)
 
 
-# --- Main Image Generator ---
+# --- Layout ---
+
+# Bump whenever the static layout below changes so stale templates on disk
+# are not reused.
+LAYOUT_VERSION = 2
+
+# Output formats.  Each one places the score panel and/or the stats panel in
+# a box on its canvas; ``scale`` multiplies every size inside the panels
+# (fonts, crests, bars, spacing), so the original 1080x1500 card is scale 1.
+# ``divider`` is the y of the rule under the score panel and ``footer`` the
+# centre of the watermark, or None to leave them out.
+FORMATS = {
+    "card": {"size": (1080, 1500), "scale": 1, "score": (40, 40, 1040, 590), "stats": (40, 620, 1040, 1380),
+             "divider": 605, "footer": (540, 1430)},
+    "story": {"size": (1080, 1920), "scale": 1, "score": (40, 160, 1040, 760), "stats": (40, 800, 1040, 1720),
+              "divider": 780, "footer": (540, 1820)},
+    "landscape": {"size": (1200, 675), "scale": 0.55, "score": (30, 30, 600, 625), "stats": (620, 30, 1170, 625),
+                  "divider": None, "footer": (600, 645)},
+    "thumbnail": {"size": (480, 270), "scale": 0.4, "score": (10, 10, 470, 260), "stats": None,
+                  "divider": None, "footer": None},
+}
+
+CARD_SIZE = FORMATS["card"]["size"]
+SCORE_BOX = FORMATS["card"]["score"]
+STATS_BOX = FORMATS["card"]["stats"]
+BAR_W = 320
+BAR_H = 24
+ROW_STEP = 110
+
+TEMPLATE_DIR = os.path.join(CACHE_DIR, "templates")
+
+_templates = {}  # key -> template image
+_templates_lock = threading.Lock()
+
+
+def _stat_area(box, scale):
+    # Vertical span the stat rows are spread over.
+    return box[1] + 110 * scale, box[3] - 40 * scale
+
+
+def stat_row_positions(num_stats, fmt="card"):
+    """Return the y coordinate of each stat row's bars in ``fmt``."""
+    spec = FORMATS[fmt]
+    stat_area_top, stat_area_bot = _stat_area(spec["stats"], spec["scale"])
+    # Dynamically space rows within the available area
+    row_step = min(ROW_STEP * spec["scale"], (stat_area_bot - stat_area_top) // max(num_stats, 1))
+
+    # Center the block vertically
+    block_height = row_step * (num_stats - 1)
+    y_start = stat_area_top + ((stat_area_bot - stat_area_top) - block_height) // 2
+    return [y_start + idx * row_step for idx in range(num_stats)]
+
+
+def _centre(box):
+    return (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+
+
+def _font(size, scale):
+    return get_font(round(size * scale))
+
+
+def _text_width(text, font):
+    bbox = text_bbox(text, font)
+    return bbox[2] - bbox[0]
+
 
-def create_match_image(data):
-    log.info("Creating graphic: Arsenal vs %s", data['opponent'])
-    width, height = 1080, 1500
-    img = Image.new('RGB', (width, height), THEME["BG"])
+# --- Static Template ---
+
+def _template_key(num_stats, theme, fmt="card"):
+    font = get_font(40)
+    fingerprint = json.dumps([theme, getattr(font, "path", "default"), FORMATS[fmt]], sort_keys=True)
+    digest = hashlib.sha1(fingerprint.encode()).hexdigest()[:12]
+    return f"{fmt}_v{LAYOUT_VERSION}_{num_stats}rows_{digest}"
+
+
+def _build_template(num_stats, theme, fmt="card"):
+    """Draw everything in ``fmt`` that does not depend on the match."""
+    spec = FORMATS[fmt]
+    s = spec["scale"]
+    img = Image.new('RGB', spec["size"], theme["BG"])
     draw = ImageDraw.Draw(img)
+    radius = round(40 * s)
+
+    box = spec["score"]
+    if box:
+        # Score container
+        draw_shadow_rect(img, *box, radius=radius, blur=20 * s, offset_x=5 * s, offset_y=7 * s)
+        draw.rounded_rectangle(box, radius=radius, fill=theme["CONTAINER"])
+        draw.text((box[0] + 40 * s, box[1] + 40 * s), "FULL TIME", font=_font(28, s), fill=theme["GOLD"])
+
+        # Divider line
+        if spec["divider"] is not None:
+            draw.line([(box[0] + 40 * s, spec["divider"]), (box[2] - 40 * s, spec["divider"])], fill="#333333", width=1)
+
+    box = spec["stats"]
+    if box:
+        # Stats container
+        draw_shadow_rect(img, *box, radius=radius, blur=20 * s, offset_x=5 * s, offset_y=7 * s)
+        draw.rounded_rectangle(box, radius=radius, fill=theme["CONTAINER"])
+        cx, _cy = _centre(box)
+
+        header_txt = "MATCH STATS"
+        f_h = _font(40, s)
+        draw.text((cx - _text_width(header_txt, f_h) / 2, box[1] + 35 * s), header_txt, font=f_h, fill=theme["TEXT"])
+        # The empty bar tracks are drawn per card, over the values: a wide
+        # value such as "100%" runs under its track.
+
+    if spec["footer"]:
+        footer_text = "GUNNER BOT"
+        f_wm = _font(20, s)
+        fx, fy = spec["footer"]
+        draw.text((fx - _text_width(footer_text, f_wm) / 2, fy), footer_text, font=f_wm, fill=theme["GOLD"])
+    return img
 
-    # Font scale
-    f_xl = get_font(140)
-    f_h = get_font(40)
-    f_sm = get_font(28)
-    f_num = get_font(36)
-    f_ctx = get_font(22)
-    f_wm = get_font(20)
-
-    cx = width / 2
-
-    # =========================================================
-    # SCORE CONTAINER  [40, 40] → [1040, 590]
-    # =========================================================
-    score_box = (40, 40, 1040, 590)
-    draw_shadow_rect(img, *score_box, radius=40)
-    draw.rounded_rectangle(score_box, radius=40, fill=THEME["CONTAINER"])
-
-    # "FULL TIME" label
-    draw.text((80, 80), "FULL TIME", font=f_sm, fill=THEME["GOLD"])
-
-    # Competition name (right-aligned)
-    if data.get('competition'):
-        comp_txt = data['competition'].upper()
-        comp_bbox = draw.textbbox((0, 0), comp_txt, font=f_sm)
-        draw.text((1040 - 40 - (comp_bbox[2] - comp_bbox[0]), 80),
-                  comp_txt, font=f_sm, fill=THEME["TEXT_DIM"])
-
-    # Score
-    cy_score = 310
-    score_txt = f"{data['ars_score']} - {data['opp_score']}"
-    bbox = draw.textbbox((0, 0), score_txt, font=f_xl)
-    sw = bbox[2] - bbox[0]
-    sh = bbox[3] - bbox[1]
-    draw.text((cx - sw / 2, cy_score - sh / 1.5), score_txt, font=f_xl, fill=THEME["TEXT"])
-
-    # Badges
-    badge_y = cy_score
-    if data.get('ars_logo_img'):
-        paste_logo_centered(img, data['ars_logo_img'], cx - sw / 2 - 120, badge_y, 180)
-    if data.get('opp_logo_img'):
-        paste_logo_centered(img, data['opp_logo_img'], cx + sw / 2 + 120, badge_y, 180)
-
-    # Goalscorers (centered under badges)
-    for goals, side_sign in [(data['ars_goals'], -1), (data['opp_goals'], 1)]:
-        y_goals = badge_y + 110
-        badge_cx = cx + side_sign * (sw / 2 + 120)
-        for i, g in enumerate(goals):
-            if i > 3:
-                break
-            bg = draw.textbbox((0, 0), g, font=f_sm)
-            draw.text((badge_cx - (bg[2] - bg[0]) / 2, y_goals + (i * 35)),
-                      g, font=f_sm, fill=THEME["TEXT_DIM"])
 
-    # Venue / Attendance context line
-    context_parts = []
-    if data.get('venue'):
-        context_parts.append(data['venue'])
-    if data.get('attendance'):
-        context_parts.append(f"Att: {data['attendance']:,}")
-    if context_parts:
-        ctx_txt = "  |  ".join(context_parts)
-        ctx_bbox = draw.textbbox((0, 0), ctx_txt, font=f_ctx)
-        draw.text((cx - (ctx_bbox[2] - ctx_bbox[0]) / 2, 555),
-                  ctx_txt, font=f_ctx, fill=THEME["TEXT_DIM"])
-
-    # =========================================================
-    # DIVIDER LINE
-    # =========================================================
-    draw.line([(80, 605), (1000, 605)], fill="#333333", width=1)
-
-    # =========================================================
-    # STATS CONTAINER  [40, 620] → [1040, 1380]
-    # =========================================================
-    stats_box = (40, 620, 1040, 1380)
-    draw_shadow_rect(img, *stats_box, radius=40)
-    draw.rounded_rectangle(stats_box, radius=40, fill=THEME["CONTAINER"])
-
-    # Header
-    header_txt = "MATCH STATS"
-    bbox_h = draw.textbbox((0, 0), header_txt, font=f_h)
-    draw.text((cx - (bbox_h[2] - bbox_h[0]) / 2, 655), header_txt, font=f_h, fill=THEME["TEXT"])
+def get_template(num_stats, theme=THEME, fmt="card"):
+    """Return the static layer of ``fmt`` for ``num_stats`` stat rows in ``theme``.
+
+    Templates are keyed by format, theme, font, LAYOUT_VERSION and row count,
+    kept in memory for the life of the process and as PNGs under
+    TEMPLATE_DIR.  The returned image is shared: callers must ``copy()`` it
+    before drawing.
+    """
+    key = _template_key(num_stats, theme, fmt)
+    with _templates_lock:
+        template = _templates.get(key)
+    if template is not None:
+        return template
 
+    # Built outside the lock so formats rendering in parallel do not queue
+    # behind each other; a rare duplicate build for one key is harmless.
+    path = os.path.join(TEMPLATE_DIR, key + ".png")
+    try:
+        with Image.open(path) as im:
+            template = im.convert('RGB')
+    except (OSError, ValueError):
+        template = _build_template(num_stats, theme, fmt)
+        try:
+            os.makedirs(TEMPLATE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            template.save(tmp, format="PNG")
+            os.replace(tmp, path)
+        except OSError as e:
+            log.warning("Could not store card template %s: %s", key, e)
+    with _templates_lock:
+        return _templates.setdefault(key, template)
+
+
+# --- Match Layer ---
+
+def build_stat_rows(data):
+    """Return the ``(label, ars_value, opp_value, is_pct)`` rows for a ``MatchRecord``."""
     # ── Possession normalization ──
-    p_a = data['ars_poss']
-    p_o = data['opp_poss']
+    p_a = data.ars_poss
+    p_o = data.opp_poss
     if p_a + p_o != 100 and p_a + p_o > 0:
         diff = 100 - (p_a + p_o)
         if p_a >= p_o:
@@ -194,44 +271,33 @@ def create_match_image(data):
         else:
             p_o += diff
 
-    # ── Build stat rows ──
     # Fixed order: POSSESSION → xG (conditional) → SHOTS → ON TARGET → PASS ACCURACY
     stats_data = [
         ("POSSESSION", f"{p_a}%", f"{p_o}%", True),
     ]
 
     # xG — only include when available
-    if data.get('ars_xg') is not None and data.get('opp_xg') is not None:
-        stats_data.append(("EXPECTED GOALS (xG)", f"{data['ars_xg']:.2f}", f"{data['opp_xg']:.2f}", False))
+    if data.ars_xg is not None and data.opp_xg is not None:
+        stats_data.append(("EXPECTED GOALS (xG)", f"{data.ars_xg:.2f}", f"{data.opp_xg:.2f}", False))
 
-    stats_data.append(("SHOTS", data['ars_shots'], data['opp_shots'], False))
-    stats_data.append(("ON TARGET", data['ars_sot'], data['opp_sot'], False))
+    stats_data.append(("SHOTS", data.ars_shots, data.opp_shots, False))
+    stats_data.append(("ON TARGET", data.ars_sot, data.opp_sot, False))
 
     # Pass accuracy — always include when available
-    if data.get('ars_pass_pct') is not None and data.get('opp_pass_pct') is not None:
-        stats_data.append(("PASS ACCURACY", f"{data['ars_pass_pct']}%", f"{data['opp_pass_pct']}%", True))
-
-    # ── Draw stat rows ──
-    num_stats = len(stats_data)
-    # Dynamically space rows within the available area (y 730 → 1340)
-    stat_area_top = 730
-    stat_area_bot = 1340
-    row_step = min(110, (stat_area_bot - stat_area_top) // max(num_stats, 1))
-
-    # Center the block vertically
-    block_height = row_step * (num_stats - 1)
-    y_start = stat_area_top + ((stat_area_bot - stat_area_top) - block_height) // 2
+    if data.ars_pass_pct is not None and data.opp_pass_pct is not None:
+        stats_data.append(("PASS ACCURACY", f"{data.ars_pass_pct}%", f"{data.opp_pass_pct}%", True))
+    return stats_data
 
-    bar_w = 320
-    bar_h = 24
 
-    for idx, (label, v_a, v_o, is_pct) in enumerate(stats_data):
-        y_stat = y_start + idx * row_step
-
-        # Label (centered)
-        lb = draw.textbbox((0, 0), label, font=f_sm)
-        draw.text((cx - (lb[2] - lb[0]) / 2, y_stat - 38), label, font=f_sm, fill=THEME["TEXT_DIM"])
+def match_content(data):
+    """Work out everything on the card that depends on the match but not the format.
 
+    Returns a dict with the texts to draw, both crests and, per stat row,
+    ``(label, ars_text, opp_text, ars_fraction, opp_fraction, ars_winning)``
+    where the fractions are bar lengths from 0 to 1.
+    """
+    rows = []
+    for label, v_a, v_o, is_pct in build_stat_rows(data):
         # Parse values
         safe_va = float(str(v_a).replace('%', '')) if v_a else 0
         safe_vo = float(str(v_o).replace('%', '')) if v_o else 0
@@ -245,32 +311,145 @@ def create_match_image(data):
 
         len_a = min((safe_va / max_val) * 100, 100)
         len_o = min((safe_vo / max_val) * 100, 100)
-        ars_winning = safe_va > safe_vo
-
-        # Arsenal value + bar (right-anchored to center)
-        draw.text((cx - 20 - bar_w - 90, y_stat - 10), str(v_a), font=f_num, fill=THEME["RED"])
-        draw.rounded_rectangle(
-            [cx - 20 - bar_w, y_stat, cx - 20, y_stat + bar_h],
-            radius=bar_h // 2, fill=THEME["BAR_TRACK"])
-        act_w = max(bar_h, int((len_a / 100) * bar_w))
-        left_col = THEME["RED"] if ars_winning else THEME["RED_DIM"]
-        right_col = THEME["RED_HI"] if ars_winning else THEME["RED"]
-        draw_gradient_pill(img, int(cx - 20 - act_w), y_stat, act_w, bar_h, left_col, right_col)
-
-        # Opponent value + bar (left-anchored from center)
-        draw.text((cx + 20 + bar_w + 20, y_stat - 10), str(v_o), font=f_num, fill=THEME["TEXT"])
-        draw.rounded_rectangle(
-            [cx + 20, y_stat, cx + 20 + bar_w, y_stat + bar_h],
-            radius=bar_h // 2, fill=THEME["BAR_TRACK"])
-        opp_act_w = max(bar_h, int((len_o / 100) * bar_w))
-        draw_gradient_pill(img, int(cx + 20), y_stat, opp_act_w, bar_h, THEME["BAR_TRACK"], THEME["BAR_OPP"])
-
-    # =========================================================
-    # FOOTER — watermark inside stats container, bottom-right
-    # =========================================================
-    footer_text = "GUNNER BOT"
-    bbox_f = draw.textbbox((0, 0), footer_text, font=f_wm)
-    draw.text((cx - (bbox_f[2] - bbox_f[0]) / 2, height - 70),
-              footer_text, font=f_wm, fill=THEME["GOLD"])
+        rows.append((label, str(v_a), str(v_o), len_a / 100, len_o / 100, safe_va > safe_vo))
 
+    # Venue / Attendance context line
+    context_parts = []
+    if data.venue:
+        context_parts.append(data.venue)
+    if data.attendance:
+        context_parts.append(f"Att: {data.attendance:,}")
+
+    return {
+        "competition": data.competition.upper() if data.competition else None,
+        "score": f"{data.ars_score} - {data.opp_score}",
+        "badges": (data.ars_badge, data.opp_badge),
+        "goals": (data.ars_goals[:4], data.opp_goals[:4]),
+        "context": "  |  ".join(context_parts) or None,
+        "rows": rows,
+    }
+
+
+def layout(content, fmt="card", theme=THEME):
+    """Place ``content`` (from ``match_content``) in ``fmt``; return the draw operations.
+
+    Each operation is a tuple: ``("text", xy, text, font, fill)``,
+    ``("crest", badge, centre_x, centre_y, height, thickness)``,
+    ``("track", box, radius, fill)`` (an empty bar) or
+    ``("pill", x, y, width, height, left_colour, right_colour)``, in drawing
+    order.  Text is
+    measured through the shared ``fonts.text_bbox`` cache, so formats at the
+    same scale measure each string once.
+    """
+    spec = FORMATS[fmt]
+    s = spec["scale"]
+    ops = []
+
+    box = spec["score"]
+    if box:
+        f_xl = _font(140, s)
+        f_sm = _font(28, s)
+        cx, cy = _centre(box)
+
+        # Competition name (right-aligned)
+        if content["competition"]:
+            ops.append(("text", (box[2] - 40 * s - _text_width(content["competition"], f_sm), box[1] + 40 * s),
+                        content["competition"], f_sm, theme["TEXT_DIM"]))
+
+        # Score
+        cy_score = cy - 5 * s
+        bbox = text_bbox(content["score"], f_xl)
+        sw = bbox[2] - bbox[0]
+        sh = bbox[3] - bbox[1]
+        ops.append(("text", (cx - sw / 2, cy_score - sh / 1.5), content["score"], f_xl, theme["TEXT"]))
+
+        # Badges, with the goalscorers centred under them
+        badge_dx = sw / 2 + 120 * s
+        ars_badge, opp_badge = content["badges"]
+        ops.append(("crest", ars_badge, cx - badge_dx, cy_score, round(180 * s), max(round(4 * s), 1)))
+        ops.append(("crest", opp_badge, cx + badge_dx, cy_score, round(180 * s), max(round(4 * s), 1)))
+        for goals, side_sign in zip(content["goals"], (-1, 1)):
+            badge_cx = cx + side_sign * badge_dx
+            for i, g in enumerate(goals):
+                ops.append(("text", (badge_cx - _text_width(g, f_sm) / 2, cy_score + 110 * s + i * 35 * s),
+                            g, f_sm, theme["TEXT_DIM"]))
+
+        if content["context"]:
+            f_ctx = _font(22, s)
+            ops.append(("text", (cx - _text_width(content["context"], f_ctx) / 2, box[3] - 35 * s),
+                        content["context"], f_ctx, theme["TEXT_DIM"]))
+
+    box = spec["stats"]
+    if box:
+        f_sm = _font(28, s)
+        f_num = _font(36, s)
+        cx, _cy = _centre(box)
+        bar_w, bar_h, gap = BAR_W * s, round(BAR_H * s), 20 * s
+        rows = content["rows"]
+        for (label, v_a, v_o, len_a, len_o, ars_winning), y_stat in zip(rows, stat_row_positions(len(rows), fmt)):
+            # Label (centered)
+            ops.append(("text", (cx - _text_width(label, f_sm) / 2, y_stat - 38 * s), label, f_sm, theme["TEXT_DIM"]))
+
+            # Team value + bar (right-anchored to center)
+            ops.append(("text", (cx - gap - bar_w - 90 * s, y_stat - 10 * s), v_a, f_num, theme["RED"]))
+            ops.append(("track", (cx - gap - bar_w, y_stat, cx - gap, y_stat + bar_h), bar_h // 2, theme["BAR_TRACK"]))
+            act_w = max(bar_h, int(len_a * bar_w))
+            left_col = theme["RED"] if ars_winning else theme["RED_DIM"]
+            right_col = theme["RED_HI"] if ars_winning else theme["RED"]
+            ops.append(("pill", int(cx - gap - act_w), y_stat, act_w, bar_h, left_col, right_col))
+
+            # Opponent value + bar (left-anchored from center)
+            ops.append(("text", (cx + gap + bar_w + gap, y_stat - 10 * s), v_o, f_num, theme["TEXT"]))
+            ops.append(("track", (cx + gap, y_stat, cx + gap + bar_w, y_stat + bar_h), bar_h // 2, theme["BAR_TRACK"]))
+            opp_act_w = max(bar_h, int(len_o * bar_w))
+            ops.append(("pill", int(cx + gap), y_stat, opp_act_w, bar_h, theme["BAR_TRACK"], theme["BAR_OPP"]))
+    return ops
+
+
+def _rasterize(content, fmt, theme):
+    img = get_template(len(content["rows"]), theme, fmt).copy()
+    draw = ImageDraw.Draw(img)
+    for op in layout(content, fmt, theme):
+        kind = op[0]
+        if kind == "text":
+            _kind, xy, text, font, fill = op
+            draw.text(xy, text, font=font, fill=fill)
+        elif kind == "crest":
+            _kind, badge, x, y, height, thickness = op
+            paste_logo_centered(img, badge, x, y, height, thickness)
+        elif kind == "track":
+            _kind, box, radius, fill = op
+            draw.rounded_rectangle(box, radius=radius, fill=fill)
+        else:
+            _kind, x, y, w, h, left, right = op
+            draw_gradient_pill(img, x, int(y), w, h, left, right)
     return img
+
+
+# --- Main Image Generator ---
+
+def create_match_images(data, formats=tuple(FORMATS), theme=THEME, workers=None):
+    """Render ``data`` (a ``summary.MatchRecord``) in every format in ``formats``.
+
+    The match-dependent values are worked out once and each format is
+    rasterized in its own thread, sharing the process-wide fonts, measured
+    text and decoded crests.  Returns ``{format: image}``.
+    """
+    log.info("Creating graphic vs %s (%s)", data.opponent, ", ".join(formats))
+    content = match_content(data)
+    if len(formats) == 1:
+        return {formats[0]: _rasterize(content, formats[0], theme)}
+    with ThreadPoolExecutor(max_workers=workers or len(formats)) as pool:
+        images = pool.map(lambda fmt: _rasterize(content, fmt, theme), formats)
+        return dict(zip(formats, images))
+
+
+def create_match_image(data, theme=THEME, fmt="card"):
+    """Render the full-time card for ``data`` (a ``summary.MatchRecord``).
+
+    The static layer comes from ``get_template``; only the match-specific
+    text, crests and stat bars are drawn here.  ``theme`` is a colour dict
+    shaped like ``config.THEME`` and ``fmt`` a key of ``FORMATS``.
+    """
+    log.info("Creating graphic vs %s", data.opponent)
+    return _rasterize(match_content(data), fmt, theme)
@@ -0,0 +1,110 @@
+import datetime
+import logging
+
+from . import cards, ledger, metrics
+from .config import DEFAULT_TEAM
+from .data import get_last_fixture_espn, get_match_stats_espn
+from .publishing import find_existing_post, post_to_bluesky
+
+log = logging.getLogger(__name__)
+
+# Exit codes understood by the poller workflow.
+POSTED = 0
+ERROR = 1
+NOTHING_TO_DO = 2
+# Only from the resident poller: the fixture was postponed or cancelled.
+CANCELLED = 3
+
+# Results are only posted this long (minutes) after the estimated final whistle.
+POST_WINDOW = 1440
+
+
+def format_caption(team, stats):
+    """Fill ``team``'s caption template from a ``MatchRecord``."""
+    return team["caption"].format(team=team["name"], team_score=stats.ars_score,
+                                  opp_score=stats.opp_score, opponent=stats.opponent)
+
+
+def minutes_since_end(stats, now=None):
+    """Minutes since the approximate end (kick-off + 115 min) of ``stats``' match."""
+    match_date = datetime.datetime.fromisoformat(stats.match_date.replace('Z', '+00:00'))
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    return (now - match_date - datetime.timedelta(minutes=115)).total_seconds() / 60
+
+
+def run_once(session, match_id=None):
+    """Run one detection → render → post attempt and return an exit code.
+
+    ``match_id`` skips fixture detection when the caller already knows which
+    match finished.  ``POSTED`` means the card went live, ``NOTHING_TO_DO``
+    covers no finished match, a result outside the posting window, a
+    duplicate and dry runs, and ``ERROR`` is anything that should be retried.
+
+    Most attempts end before a card is needed, so the renderer and Pillow
+    are only imported once there is something to post, and a retry with
+    unchanged stats reuses the card stored by ``cards.render_card``.
+    """
+    log.info("GUNNER BOT: Checking for recent results...")
+
+    # 1. Get latest match data
+    espn_id = match_id or get_last_fixture_espn()
+    if not espn_id:
+        log.info("No completed games found.")
+        return NOTHING_TO_DO
+    metrics.set_value("match_id", espn_id)
+
+    # 2. Check the local ledger before doing any work
+    ledger_missing = not ledger.exists()
+    if ledger.is_posted(espn_id):
+        log.info("Match %s is already in the posted ledger. Skipping.", espn_id)
+        return NOTHING_TO_DO
+
+    stats = get_match_stats_espn(espn_id)
+    if not stats:
+        log.error("Could not fetch match stats.")
+        return ERROR
+
+    # 3. Check time window (only post within 24 hours of match end).  Stats
+    # only come back once ESPN reports the match as finished, so there is no
+    # lower bound: a match that ends before the kick-off + 115 min estimate
+    # is posted straight away.
+    try:
+        match_date = datetime.datetime.fromisoformat(stats.match_date.replace('Z', '+00:00'))
+        time_since_end = minutes_since_end(stats)
+
+        log.info("Match: %s | Approx end: %.0f min ago", match_date, time_since_end)
+
+        if time_since_end > POST_WINDOW:
+            log.info("Match result is outside 24-hour window. Skipping.")
+            return NOTHING_TO_DO
+
+        # 4. Without a ledger (first run on this machine), reconcile with the feed
+        if session and ledger_missing:
+            uri = find_existing_post(session, stats.opponent, since=match_date)
+            if uri is not None:
+                ledger.record(espn_id, stats.opponent, stats.match_date, uri)
+                log.info("Already posted this result. Skipping.")
+                return NOTHING_TO_DO
+
+        log.info("Generating report for Arsenal vs %s", stats.opponent)
+        image_data, mime_type = cards.render_card(stats)
+
+        caption = format_caption(DEFAULT_TEAM, stats)
+
+        if session:
+            uri = post_to_bluesky(session, image_data, caption, mime_type)
+            if uri is None:
+                return ERROR
+            metrics.set_value("posted_at", datetime.datetime.now(datetime.timezone.utc).isoformat())
+            ledger.record(espn_id, stats.opponent, stats.match_date, uri)
+            return POSTED
+
+        filename = f"result_{stats.opponent}.{mime_type.split('/')[1]}"
+        with open(filename, "wb") as f:
+            f.write(image_data)
+        log.info("[DRY RUN] Would post: %s (card saved to %s)", caption, filename)
+        return NOTHING_TO_DO
+
+    except Exception as e:
+        log.exception("Error in main execution: %s", e)
+        return ERROR
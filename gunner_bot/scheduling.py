@@ -0,0 +1,173 @@
+"""Poller dispatch planning: ``python -m gunner_bot.scheduling``.
+
+Reads every configured league's scoreboard for the next few days (one
+request per league, through the same on-disk HTTP cache as the bot) and
+prints a JSON plan with each upcoming fixture's kick-off, when polling
+should start and when the poller should be dispatched.  Only the standard
+library is imported, so the scheduler workflow needs no ``pip install``.
+
+The scheduler runs hourly.  A fixture is marked for dispatch once its
+dispatch time falls before the end of the run's slot (the hour the run
+belongs to), so every poller is started at most ``DISPATCH_LEAD`` plus one
+slot before it has to poll, and nothing sleeps for hours in a chain of
+jobs.  Scheduled runs start late and are sometimes dropped, so dispatch
+times up to ``CATCH_UP`` in the past are still marked; the workflow skips
+fixtures that already have a poller run.  ``--due`` marks every fixture
+whose dispatch time has passed, for manual runs.
+"""
+import argparse
+import datetime
+import json
+import logging
+import sys
+import urllib.error
+import urllib.request
+
+from .cache import cached_get
+from .config import ESPN_BASE_URL, TEAMS
+from .polling import CANCELLED_STATUSES
+
+log = logging.getLogger(__name__)
+
+# Polling starts this long after kick-off (90 min + 10 min buffer).
+POLL_AFTER_KICKOFF = 100 * 60
+# Pollers are dispatched this long before they start polling, which covers
+# dependency install and prefetch as well as cron start-up delay.
+DISPATCH_LEAD = 30 * 60
+# Fixtures that kicked off longer ago than this are not dispatched any more.
+STALE_AFTER = 3 * 3600
+# How far back a scheduled run picks up dispatch times missed by a late or
+# skipped earlier run.
+CATCH_UP = 2 * 3600
+
+
+class _Response:
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+
+def _urllib_get(url, headers=None, timeout=None):
+    req = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout or 10) as r:
+            return _Response(r.status, r.headers, r.read())
+    except urllib.error.HTTPError as e:
+        # Includes 304 Not Modified, which the cache handles.
+        return _Response(e.code, e.headers, e.read())
+
+
+def _parse_date(s):
+    return datetime.datetime.fromisoformat(s.replace('Z', '+00:00'))
+
+
+def _iso(dt):
+    return dt.isoformat().replace('+00:00', 'Z')
+
+
+def upcoming_fixtures(teams, start, end):
+    """Return ``{match_id: fixture}`` for configured teams' matches between ``start`` and ``end``."""
+    dates = f"{start - datetime.timedelta(days=1):%Y%m%d}-{end:%Y%m%d}"
+    by_league = {}
+    for team in teams:
+        for league in team["leagues"]:
+            by_league.setdefault(league, {})[str(team["team_id"])] = team["key"]
+
+    fixtures = {}
+    for league, wanted in sorted(by_league.items()):
+        url = f"{ESPN_BASE_URL}/{league}/scoreboard?dates={dates}"
+        try:
+            r = cached_get(url, "scoreboard", transport=_urllib_get)
+            events = json.loads(r.content).get("events", []) if r.status_code == 200 else []
+        except (OSError, ValueError) as e:
+            log.warning("Could not read %s scoreboard: %s", league, e)
+            continue
+        for e in events:
+            try:
+                competition = e['competitions'][0]
+                kickoff = _parse_date(e['date'])
+                keys = [wanted[c['id']] for c in competition['competitors'] if c['id'] in wanted]
+                if not keys or not start - datetime.timedelta(seconds=STALE_AFTER) <= kickoff < end:
+                    continue
+                fixture = fixtures.setdefault(e['id'], {
+                    "id": e['id'],
+                    "league": league,
+                    "name": e.get('name', ''),
+                    "kickoff": kickoff,
+                    "state": competition['status']['type']['state'],
+                    "status": competition['status']['type'].get('name', ''),
+                    "teams": [],
+                })
+                fixture["teams"] = sorted(set(fixture["teams"]) | set(keys))
+            except (KeyError, IndexError, TypeError, ValueError):
+                log.warning("Malformed %s scoreboard event", league)
+    return fixtures
+
+
+def plan(now, days=7, slot=3600, due=False, teams=TEAMS, catch_up=CATCH_UP):
+    """Build the dispatch plan for the ``days`` days from ``now``.
+
+    The current slot starts at ``now`` rounded down to a multiple of
+    ``slot`` seconds; fixtures are dispatched from ``catch_up`` seconds
+    before ``now`` to the end of the slot.
+    """
+    slot_start = datetime.datetime.fromtimestamp(now.timestamp() // slot * slot, datetime.timezone.utc)
+    slot_end = slot_start + datetime.timedelta(seconds=slot)
+    since = now - datetime.timedelta(seconds=catch_up)
+    fixtures = upcoming_fixtures(teams, now, now + datetime.timedelta(days=days))
+
+    entries = []
+    for f in sorted(fixtures.values(), key=lambda f: f["kickoff"]):
+        poll_start = f["kickoff"] + datetime.timedelta(seconds=POLL_AFTER_KICKOFF)
+        dispatch_at = poll_start - datetime.timedelta(seconds=DISPATCH_LEAD)
+        stale = (now - f["kickoff"]).total_seconds() > STALE_AFTER
+        if f["status"] in CANCELLED_STATUSES or f["state"] == "post" or stale:
+            dispatch = False
+        elif due:
+            dispatch = dispatch_at <= now
+        else:
+            dispatch = since <= dispatch_at < slot_end
+        entries.append(dict(
+            f,
+            kickoff=_iso(f["kickoff"]),
+            poll_start=_iso(poll_start),
+            dispatch_at=_iso(dispatch_at),
+            wait_seconds=max(int((poll_start - now).total_seconds()), 0),
+            dispatch=dispatch,
+        ))
+    return {
+        "generated_at": _iso(now),
+        "slot": [_iso(slot_start), _iso(slot_end)],
+        "catch_up_since": _iso(since),
+        "days": days,
+        "fixtures": entries,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gunner_bot.scheduling",
+                                     description="Print the poller dispatch plan as JSON.")
+    parser.add_argument("--days", type=int, default=7, help="How far ahead to look (default: 7)")
+    parser.add_argument("--slot", type=int, default=3600,
+                        help="Seconds between scheduler runs; fixtures are dispatched in their slot (default: 3600)")
+    parser.add_argument("--catch-up", type=int, default=CATCH_UP,
+                        help=f"Also dispatch fixtures whose dispatch time passed this many seconds ago (default: {CATCH_UP})")
+    parser.add_argument("--due", action="store_true",
+                        help="Dispatch everything whose dispatch time has passed (manual runs)")
+    parser.add_argument("--now", help="Plan as of this ISO time instead of the current time")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    now = _parse_date(args.now) if args.now else datetime.datetime.now(datetime.timezone.utc)
+    result = plan(now, args.days, args.slot, args.due, catch_up=args.catch_up)
+    for f in result["fixtures"]:
+        log.info("%s %s | kick-off %s | dispatch %s%s", f["id"], f["name"], f["kickoff"], f["dispatch_at"],
+                 " <- now" if f["dispatch"] else "")
+    json.dump(result, sys.stdout, indent=1)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
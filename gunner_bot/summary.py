@@ -0,0 +1,185 @@
+"""ESPN match summary parsing.
+
+A summary body is mostly commentary, rosters, odds and news; the card only
+needs ``header`` (score, teams, scoring plays), ``gameInfo`` and
+``boxscore``.  ``load_summary`` decodes the top-level members one at a time
+and keeps only those, so the rest of the document is never held in memory
+as a whole.  Boxscore statistics are mapped through the ``STATS`` registry
+onto a ``MatchRecord``.
+"""
+import json
+import logging
+import re
+
+from .badges import fetch_crest
+from .config import TEAM_ID_ESPN
+from .polling import CANCELLED_STATUSES
+
+log = logging.getLogger(__name__)
+
+SUMMARY_KEYS = frozenset({"header", "gameInfo", "boxscore"})
+
+SIDES = ("ars", "opp")
+
+# ESPN boxscore stat name -> (MatchRecord field suffix, converter, default).
+# Each entry becomes an ``ars_<field>`` and an ``opp_<field>`` attribute.
+STATS = {
+    "possessionPct": ("poss", int, 0),
+    "totalShots": ("shots", int, 0),
+    "shotsOnTarget": ("sot", int, 0),
+    "passPct": ("pass_pct", lambda v: int(round(v * 100)), None),
+    "expectedGoals": ("xg", lambda v: round(v, 2), None),
+}
+
+_decoder = json.JSONDecoder()
+_ws = re.compile(r"[ \t\n\r]*")
+
+
+def load_summary(content, keys=SUMMARY_KEYS):
+    """Decode a summary body, keeping only the top-level members in ``keys``.
+
+    Each member is decoded with the C scanner and dropped straight away if
+    it is not wanted.  Raises ``ValueError`` for anything that is not a JSON
+    object.
+    """
+    s = content.decode("utf-8") if isinstance(content, bytes) else content
+    i = _ws.match(s).end()
+    if s[i:i + 1] != "{":
+        raise ValueError("summary body is not a JSON object")
+    out = {}
+    i = _ws.match(s, i + 1).end()
+    if s[i:i + 1] == "}":
+        return out
+    while True:
+        key, i = _decoder.raw_decode(s, i)
+        i = _ws.match(s, i).end()
+        if s[i:i + 1] != ":":
+            raise ValueError(f"expected ':' at offset {i}")
+        value, i = _decoder.raw_decode(s, _ws.match(s, i + 1).end())
+        if key in keys:
+            out[key] = value
+        del value
+        i = _ws.match(s, i).end()
+        if s[i:i + 1] == "}":
+            return out
+        if s[i:i + 1] != ",":
+            raise ValueError(f"expected ',' or '}}' at offset {i}")
+        i = _ws.match(s, i + 1).end()
+
+
+class MatchRecord:
+    """One finished match, as drawn on the card.
+
+    ``ars_*`` fields belong to the club the card is for (Arsenal unless a
+    different ``team_id`` was parsed for) and ``opp_*`` to its opponent.
+    Besides the fields below there is an ``ars_<field>`` / ``opp_<field>``
+    pair for every entry in ``STATS``.
+    """
+    opponent: str
+    ars_score: str
+    opp_score: str
+    ars_badge: str
+    opp_badge: str
+    ars_goals: list
+    opp_goals: list
+    match_date: str
+    venue: str
+    attendance: int
+    referee: str
+    competition: str
+
+    __slots__ = (
+        "opponent", "ars_score", "opp_score", "ars_badge", "opp_badge", "ars_goals", "opp_goals",
+        "match_date", "venue", "attendance", "referee", "competition",
+    ) + tuple(f"{side}_{field}" for field, _, _ in STATS.values() for side in SIDES)
+
+    def __init__(self, **fields):
+        self.ars_badge = self.opp_badge = self.attendance = None
+        self.ars_goals, self.opp_goals = [], []
+        self.venue = self.referee = self.competition = ""
+        for field, _, default in STATS.values():
+            for side in SIDES:
+                setattr(self, f"{side}_{field}", default)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+    def __repr__(self):
+        return f"MatchRecord({self.ars_score}-{self.opp_score} vs {getattr(self, 'opponent', '?')}, {getattr(self, 'match_date', '?')})"
+
+
+def _number(display):
+    try:
+        return float(display) if "." in display else int(display)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _goal_lines(details, team):
+    scorers = {side: {} for side in SIDES}
+    for e in details:
+        if not e.get('scoringPlay', False):
+            continue
+        scorer_full = e.get('participants', [{}])[0].get('athlete', {}).get('displayName', 'Unknown')
+        scorer_last = scorer_full.split()[-1].upper()
+        if e.get('ownGoal', False):
+            scorer_last += " (OG)"
+
+        time_str = e.get('clock', {}).get('displayValue', '')
+        if ":" in time_str:
+            time_str = time_str.split(":")[0]
+        if not time_str.endswith("'"):
+            time_str += "'"
+
+        side = "ars" if e.get('team', {}).get('id') == team else "opp"
+        scorers[side].setdefault(scorer_last, []).append(time_str)
+    return [[f"{name}   {', '.join(times)}" for name, times in scorers[side].items()] for side in SIDES]
+
+
+def parse_match_summary(r_data, match_id=None, team_id=TEAM_ID_ESPN):
+    """Turn a (possibly ``load_summary``-trimmed) payload into a ``MatchRecord``.
+
+    Returns None if the match is not finished (including postponed or
+    abandoned fixtures) or the payload is malformed.
+    """
+    team = str(team_id)
+    try:
+        competition = r_data['header']['competitions'][0]
+        status = competition['status']['type']
+        if status['state'] != 'post' or status.get('name') in CANCELLED_STATUSES:
+            return None
+
+        competitors = competition['competitors']
+        ars, opp = (competitors[0], competitors[1]) if competitors[0]['id'] == team else (competitors[1], competitors[0])
+
+        game_info = r_data.get('gameInfo', {})
+        officials = game_info.get('officials', [])
+        record = MatchRecord(
+            opponent=opp['team']['displayName'],
+            ars_score=ars['score'], opp_score=opp['score'],
+            ars_badge=fetch_crest(ars['id'], ars['team']['logos'][0]['href']),
+            opp_badge=fetch_crest(opp['id'], opp['team']['logos'][0]['href']),
+            match_date=competition['date'],
+            venue=game_info.get('venue', {}).get('fullName', ''),
+            attendance=game_info.get('attendance'),
+            referee=officials[0].get('displayName', '') if officials else '',
+            competition=r_data['header'].get('league', {}).get('name', ''),
+        )
+
+        for box in r_data.get('boxscore', {}).get('teams', []):
+            side = "ars" if box['team']['id'] == team else "opp"
+            for s in box.get('statistics', []):
+                spec = STATS.get(s.get('name'))
+                if spec is not None:
+                    field, convert, _ = spec
+                    setattr(record, f"{side}_{field}", convert(_number(s.get('displayValue'))))
+
+        details = competition.get('details', [])
+        if details:
+            record.ars_goals, record.opp_goals = _goal_lines(details, team)
+        return record
+    except Exception:
+        log.exception("Error parsing stats for match %s", match_id)
+        return None
@@ -0,0 +1,175 @@
+"""Multi-club runner: ``python -m gunner_bot.teams``.
+
+One attempt for every entry in ``config.TEAMS``.  Each league any of the
+clubs plays in is read once (as a scoreboard), each finished match's
+summary is fetched once even if both clubs in it are configured, the
+cards are rendered in parallel worker processes and each one is published
+to its club's account as soon as it is ready.  Every account keeps its own
+session and posted ledger, so the run can be repeated until it exits 0.
+Exit codes match ``app.py``: 1 if any club failed, else 0 if any posted.
+"""
+import argparse
+import datetime
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from . import cards, ledger, metrics
+from .cache import get_cache_stats, log_cache_stats
+from .config import IMAGE_FORMAT, TEAMS
+from .data import fetch_match_summary, get_recent_results
+from .publishing import find_existing_post, get_bluesky_session, log_session_stats, post_to_bluesky
+from .runner import ERROR, NOTHING_TO_DO, POST_WINDOW, POSTED, format_caption, minutes_since_end
+from .summary import parse_match_summary
+
+log = logging.getLogger(__name__)
+
+
+def render_card(stats, theme, fmt):
+    """Render and encode one card."""
+    return cards.render_card(stats, theme, fmt)
+
+
+def _render_in_worker(stats, theme, fmt):
+    """``render_card`` in a worker process.
+
+    Also returns the worker's card cache counts and stage timings, which
+    would otherwise stay in the worker, for the parent to record.
+    """
+    card = render_card(stats, theme, fmt)
+    return card, cards.take_card_stats(), metrics.take_stages()
+
+
+def _publish(team, match_id, stats, image_data, mime_type):
+    with metrics.stage("publish"):
+        return _publish_card(team, match_id, stats, image_data, mime_type)
+
+
+def _publish_card(team, match_id, stats, image_data, mime_type):
+    caption = format_caption(team, stats)
+    session = get_bluesky_session(os.environ.get(team["handle_env"]), os.environ.get(team["password_env"]),
+                                  team["session_file"])
+    if not session:
+        filename = f"result_{team['key']}_{stats.opponent}.{mime_type.split('/')[1]}"
+        with open(filename, "wb") as f:
+            f.write(image_data)
+        log.info("[DRY RUN] %s would post: %s (card saved to %s)", team["key"], caption, filename)
+        return NOTHING_TO_DO
+
+    if not ledger.exists(team["ledger_file"]):
+        since = datetime.datetime.fromisoformat(stats.match_date.replace('Z', '+00:00'))
+        uri = find_existing_post(session, stats.opponent, since=since)
+        if uri is not None:
+            ledger.record(match_id, stats.opponent, stats.match_date, uri, path=team["ledger_file"])
+            log.info("%s already posted match %s. Skipping.", team["key"], match_id)
+            return NOTHING_TO_DO
+
+    uri = post_to_bluesky(session, image_data, caption, mime_type)
+    if uri is None:
+        return ERROR
+    ledger.record(match_id, stats.opponent, stats.match_date, uri, path=team["ledger_file"])
+    log.info("%s posted match %s", team["key"], match_id)
+    return POSTED
+
+
+def _due_cards(teams):
+    """Return ``(team, match_id, stats)`` for every club with an unposted result, and the error count."""
+    results = get_recent_results({team["team_id"]: team["leagues"] for team in teams})
+    unposted = []
+    for team in teams:
+        match_id = results.get(str(team["team_id"]))
+        if match_id is None:
+            log.info("%s: no completed match in the last few days", team["key"])
+        elif ledger.is_posted(match_id, team["ledger_file"]):
+            log.info("%s: match %s already posted", team["key"], match_id)
+        else:
+            unposted.append((team, match_id))
+    if not unposted:
+        return [], 0
+
+    match_ids = sorted({match_id for _team, match_id in unposted})
+    with metrics.stage("summary"), ThreadPoolExecutor(max_workers=len(match_ids)) as pool:
+        payloads = dict(zip(match_ids, pool.map(fetch_match_summary, match_ids)))
+
+    due, errors = [], 0
+    with metrics.stage("parse"):
+        for team, match_id in unposted:
+            payload = payloads[match_id]
+            stats = parse_match_summary(payload, match_id, team["team_id"]) if payload else None
+            if stats is None:
+                log.error("%s: could not get stats for match %s", team["key"], match_id)
+                errors += 1
+            elif minutes_since_end(stats) > POST_WINDOW:
+                log.info("%s: match %s is outside the posting window", team["key"], match_id)
+            else:
+                due.append((team, match_id, stats))
+    return due, errors
+
+
+def run_teams(teams=TEAMS, fmt=IMAGE_FORMAT, workers=None):
+    """Post every configured club's latest result; return an exit code."""
+    due, errors = _due_cards(teams)
+    codes = [ERROR] * errors
+    if due:
+        # Worker processes only pay off once there is more than one card.
+        in_workers = len(due) > 1
+        renderers = (ProcessPoolExecutor(max_workers=min(len(due), workers or os.cpu_count() or 1))
+                     if in_workers else ThreadPoolExecutor(max_workers=1))
+        render = _render_in_worker if in_workers else render_card
+        # Render and encode are timed inside cards.render_card (and passed
+        # back from worker processes); publishing is timed per card.
+        with renderers, ThreadPoolExecutor(max_workers=len(due)) as publishers:
+            renders = {renderers.submit(render, stats, team["theme"], fmt): (team, match_id, stats)
+                       for team, match_id, stats in due}
+            posts = {}
+            for fut in as_completed(renders):
+                team, match_id, stats = renders[fut]
+                try:
+                    if in_workers:
+                        (image_data, mime_type), card_stats, stages = fut.result()
+                        cards.add_card_stats(card_stats)
+                        metrics.add_stages(stages)
+                    else:
+                        image_data, mime_type = fut.result()
+                except Exception:
+                    log.exception("%s: rendering match %s failed", team["key"], match_id)
+                    codes.append(ERROR)
+                    continue
+                posts[publishers.submit(_publish, team, match_id, stats, image_data, mime_type)] = team
+            for fut in as_completed(posts):
+                try:
+                    codes.append(fut.result())
+                except Exception:
+                    log.exception("%s: publishing failed", posts[fut]["key"])
+                    codes.append(ERROR)
+
+    if ERROR in codes:
+        return ERROR
+    return POSTED if POSTED in codes else NOTHING_TO_DO
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gunner_bot.teams",
+                                     description="Post the latest result for every configured club.")
+    parser.add_argument("--format", default=IMAGE_FORMAT, help="Card encoder (default: config.IMAGE_FORMAT)")
+    parser.add_argument("--workers", type=int, help="Render processes (default: one per card, up to CPU count)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    log.info("Checking %d club(s): %s", len(TEAMS), ", ".join(team["key"] for team in TEAMS))
+    code = ERROR
+    try:
+        code = run_teams(TEAMS, args.format, args.workers)
+        return code
+    finally:
+        log_cache_stats()
+        log_session_stats()
+        metrics.set_value("exit_code", code)
+        metrics.set_value("http_cache", get_cache_stats())
+        metrics.set_value("card_cache", cards.get_card_stats())
+        metrics.write_summary()
+
+
+if __name__ == "__main__":
+    sys.exit(main())